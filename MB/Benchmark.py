@@ -0,0 +1,141 @@
+from time import perf_counter
+from contextlib import redirect_stdout
+from io import StringIO
+from statistics import median
+import warnings
+import platform
+import json
+import sys
+import os
+import numpy as np
+
+#Stored reference timings, a case fails when its best time exceeds factor*reference on the machine the baseline was made on
+BASELINE = 'Data/BenchmarkBaseline.json'
+FACTOR = 2.5
+
+
+def environment():
+    '''Machine and versions the timings depend on, timings are only compared between equal environments'''
+    import openmdao
+    processor = platform.processor()
+    if os.path.exists('/proc/cpuinfo'):
+        with open('/proc/cpuinfo') as cpuinfo:
+            processor = next((line.split(':', 1)[1].strip() for line in cpuinfo if line.startswith('model name')), processor)
+    return {'machine': platform.machine(), 'processor': processor, 'cpus': os.cpu_count(),
+            'python': platform.python_version(), 'numpy': np.__version__, 'openmdao': openmdao.__version__}
+
+
+def timeit(func, repeat=5, number=1):
+    '''Runs func number times per repeat and returns the time per call in [s] of every repeat'''
+    func()                                  #Warm up (data registry, imports, set up)
+    times = []
+    for i in range(repeat):
+        start = perf_counter()
+        for j in range(number):
+            func()
+        times.append((perf_counter()-start)/number)
+    return times
+
+
+def ohb_cases():
+    from OHBModel import OHBModel, OHBModel_batch
+    Isps = np.linspace(300., 3500., 10000)
+    tdays = np.repeat([90., 180., 360., 720.], 2500)
+    yield 'OHBModel single, launcher curve', lambda: OHBModel(2000., 2500., 90*24*3600., 1000., 23222e3, launcher='Soyuz'), 200
+    yield 'OHBModel single, given separation mass', lambda: OHBModel(2000., 2500., 90*24*3600., 1000., 23222e3, M_sep_v=4000.), 200
+    yield 'OHBModel_batch 10000, launcher curve', lambda: OHBModel_batch(Isps, 2500., tdays*24*3600., 1000., 23222e3, launcher='Soyuz'), 10
+    yield 'OHBModel_batch 10000, given separation mass', lambda: OHBModel_batch(Isps, 2500., tdays*24*3600., 1000., 23222e3, M_sep_v=4000.), 10
+
+
+def mbcalc_cases():
+    from MBCalcFunc import MBatteryCalc, MSolarCalc
+    masses = np.linspace(1., 40., 40)
+    yield 'MBatteryCalc 40 battery masses', lambda: [MBatteryCalc(M) for M in masses], 5
+    yield 'MSolarCalc 40 solar array masses', lambda: [MSolarCalc(M) for M in masses], 5
+
+
+def nightcycle_cases():
+    from openmdao.api import Problem, Group
+    from NightCycle import MBOne
+    from SatCatalog import LoadCatalog
+    for sat in LoadCatalog().values():
+        if sat.P_th is None:
+            continue
+        p = Problem()
+        p.model = Group()
+        p.model.add_subsystem('test1', MBOne(Sat=sat.SatelliteName), promotes=['*'])
+        p.setup()
+        p['M_sa'] = 100.
+        p['M_batt'] = 20.
+        yield f'NightCycle MBOne {sat.SatelliteName}', p.run_model, 1
+
+
+def massbalance_cases():
+    from MassBalance import MassBalanceProblem
+    def run():
+        prob = MassBalanceProblem(debug_print=False)
+        prob.run_driver()
+    yield 'MassBalance SLSQP', run, 1
+
+
+def run_benchmarks(savepath='Data/Output/benchmark.json', baseline=BASELINE, factor=FACTOR, repeat=5, update=False):
+    '''Times all benchmark cases and writes the results to savepath as json.
+    Every case is compared to the best time stored in the baseline file; it regresses when its best time is more than factor times slower.
+    The best of the repeats is used because it is the least sensitive to other load on the machine.
+    Absolute timings are only comparable on the same machine with the same versions: in any other environment
+    than the one stored in the baseline, slower cases are only reported as warnings and do not count as regressions.
+    With update=True the baseline file is (re)written with the current timings and environment instead.
+
+    savepath    = pathstring of the json results file
+    baseline    = pathstring of the json file with reference best times in [s] per case
+    factor      = Allowed slowdown relative to the baseline before a case counts as a regression
+    repeat      = Amount of timed repeats per case
+
+    returns the list of regressed case names
+    '''
+    reference, reference_env = {}, None
+    if os.path.exists(baseline):
+        with open(baseline) as jsonfile:
+            stored = json.load(jsonfile)
+        #Baselines without an environment are from an unknown machine
+        reference, reference_env = stored.get('times', stored), stored.get('environment')
+    env = environment()
+    comparable = env == reference_env
+    if reference and not comparable:
+        print(f"Baseline was made in another environment ({reference_env}), slower cases are only warnings")
+
+    results = []
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        for cases in (ohb_cases, mbcalc_cases, nightcycle_cases, massbalance_cases):
+            for name, func, number in cases():
+                #The models print status messages, which are not part of the timing
+                with redirect_stdout(StringIO()):
+                    times = timeit(func, repeat=repeat, number=number)
+                result = {'name': name, 'median': median(times), 'min': min(times), 'repeat': repeat, 'number': number}
+                flag = ''
+                if name in reference:
+                    result['threshold'] = factor*reference[name]
+                    slower = result['min'] > result['threshold']
+                    result['regression'] = slower and comparable
+                    flag = ('  REGRESSION' if comparable else '  WARNING, slower than baseline') if slower else ''
+                results.append(result)
+                print(f"{name:50s} {result['min']*1000:10.3f} ms" + flag)
+
+    os.makedirs(os.path.dirname(savepath), exist_ok=True)
+    with open(savepath, 'w') as jsonfile:
+        json.dump({'environment': env, 'comparable': comparable, 'factor': factor, 'results': results}, jsonfile, indent=1)
+
+    if update == True:
+        with open(baseline, 'w') as jsonfile:
+            json.dump({'environment': env, 'times': {result['name']: result['min'] for result in results}}, jsonfile, indent=1)
+
+    return [result['name'] for result in results if result.get('regression')]
+
+
+if __name__ == '__main__':
+    #python Benchmark.py [--update], exits with 1 when a case regressed so nightly runs can fail on it
+    regressions = run_benchmarks(update='--update' in sys.argv)
+    if regressions:
+        print(f"Regressions: {regressions}")
+        sys.exit(1)
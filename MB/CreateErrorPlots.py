@@ -1,44 +1,18 @@
-from csvtodict import csvtodict
-from scipy.interpolate import interp1d
-from csv import reader
+from figuredata import load_figuredata
 import matplotlib.pyplot as plt
 from FiguresDataCreate import create_fig3data, create_fig4data
-import os
 
 
-def fig3errorplot(path,inputR=False,inputM=False,erroronly=False,savefile=False,graph=False):
-    '''Turns data csv file created by create_fig3data into 3 error graphs that compares the model data with the orignal paper data'''
-    create_fig3data(path,Isprange=(260,3600),step=20,inputR=inputR,inputM=inputM,graph=False)
+def fig3errorplot(path=None,inputR=False,inputM=False,erroronly=False,savefile=False,graph=False):
+    '''Creates the model data of create_fig3data and turns it into 3 error graphs that compare the model data with the orignal paper data.
+    The model data is passed on in memory, it is only written to path as well if savefile is True'''
+    modeldict = create_fig3data(path if savefile == True else None,Isprange=(260,3600),step=20,inputR=inputR,inputM=inputM,graph=False)
     #Figure Number to plot
     fign = 3
     #Calling Original Data
-    fig_dict, fig_names = csvtodict(f'Data/Fig{fign}Wollenhaupt.csv',give_names=True)
-    print(f'Figure names are:{fig_names}')
+    figdata = load_figuredata(f'Data/Fig{fign}Wollenhaupt.csv')
+    print(f'Figure names are:{figdata.names}')
 
-    #Opening Model data
-    modelfile = reader(open(path))
-    # fig4modelfile = reader(open('Data/launcherdata.csv'))
-
-    #Interpolating Original Data to interpolated curve functions in a dictionary
-    funcdict = {}
-    for fig_name in fig_names:
-        funcdict[f'{fig_name}'] = interp1d(fig_dict[f'{fig_name} Xdata'],fig_dict[f'{fig_name} Ydata'])
-
-    #Turning modelfile into a dictionary with all relevant data
-    #(bit annoying because the modelfile has different transfer times below eachother instead of different columns)
-    counter = 45
-    modeldict = {}
-    for row in modelfile:
-        if 'Isp' in row[0]:
-            counter *=2
-            datalist = []
-        else:
-            Isp  = float(row[0])
-            Rinj = float(row[1])
-            Msep = float(row[2])
-            Teff = float(row[3])
-            datalist.append([Isp, Rinj, Msep, Teff])
-            modeldict[f'{counter}days'] = datalist
     if erroronly == True:
         fig2, ax4 = plt.subplots()
         ax4.set_xlabel('Specific Impulse [s]')
@@ -83,33 +57,14 @@ def fig3errorplot(path,inputR=False,inputM=False,erroronly=False,savefile=False,
             ax3.spines['right'].set_visible(True)
 
 
-        #Main data Loop
-        Isplist = []
-        #List will all be [0]=Inject Height,[1]=Separation Mass,[2]=Transfer Efficiency
-        modellist = [[],[],[]]
-        OGlist = [[],[],[]]
-        errorlist = [[],[],[]]
-        for data in modeldict[f'{days}days']:
-                #Assigning Correct Values
-                Isp     = float(data[0])
-                Rinj    = float(data[1])
-                Msep    = float(data[2])
-                Teff    = float(data[3])
-                #Assigning the previously interpolated functions
-                Rfunc   = funcdict[f'Inject Height {days} d']
-                Mfunc   = funcdict[f'Sep. Mass {days} d']
-                Sfunc   = funcdict[f'Trans. Eff. {days} d']
-
-                #Setting up iterables
-                variables   = [Rinj, Msep, Teff]
-                ilist       = [0,1,2]
-                functions   = [Rfunc,Mfunc,Sfunc]
-                #Append Values to the right lists
-                for variable,i,func in zip(variables,ilist,functions):
-                    modellist[i].append(variable)
-                    OGlist[i].append(func(Isp))
-                    errorlist[i].append((variable-func(Isp))/func(Isp)*100.)
-                Isplist.append(Isp)
+        #Main data, rows will all be [0]=Inject Height,[1]=Separation Mass,[2]=Transfer Efficiency
+        modeldata   = modeldict[days]
+        Isplist     = modeldata[:,0]
+        modellist   = modeldata[:,1:].T
+        #Original data interpolated at all model Isps at once
+        OGlist      = figdata.interpolate(Isplist,[f'Inject Height {days} d',f'Sep. Mass {days} d',f'Trans. Eff. {days} d'])
+        errorlist   = (modellist-OGlist)/OGlist*100.
+        ilist       = [0,1,2]
         #Setting up iterables
         colors      = ['g','k','orange']
         labels      = ['Inject Height','Sep. Mass','Trans. Eff.']
@@ -141,56 +96,17 @@ def fig3errorplot(path,inputR=False,inputM=False,erroronly=False,savefile=False,
         fig2.legend(loc='upper right',bbox_to_anchor= (.95,0.85))
         plt.show()
 
-    if savefile == False:
-        os.remove(path)
-
-def fig4errorplot(path,inputR=False,inputM=False,erroronly=False,savefile=False):
-    create_fig4data(path,Isprange=(260,3600),step=20,inputR=inputR,inputM=inputM,graph=False)
-    #Figure Number to plot
-    fign = 4
-    #Calling Original Data
-    fig_dict, fig_names = csvtodict(f'Data/Fig{fign}Wollenhaupt.csv',give_names=True)
-    # print(f'Figure names are:{fig_names}')
-
-    #Opening Model data
-    modelfile = reader(open(path))
-
-
-    #Interpolating Original Data to interpolated curve functions in a dictionary
-    funcdict = {}
-    for fig_name in fig_names:
-        funcdict[f'{fig_name}'] = interp1d(fig_dict[f'{fig_name} Xdata'],fig_dict[f'{fig_name} Ydata'])
-
 
+def fig4errorplot(path=None,inputR=False,inputM=False,erroronly=False,savefile=False):
+    '''Creates the model data of create_fig4data and turns it into error graphs per launcher that compare the model data with the orignal paper data.
+    The model data is passed on in memory, it is only written to path as well if savefile is True'''
+    modeldict = create_fig4data(path if savefile == True else None,Isprange=(260,3600),step=20,inputR=inputR,inputM=inputM,graph=False)
     #Figure Number to plot
     fign = 4
     #Calling Original Data
-    fig_dict, fig_names = csvtodict(f'Data/Fig{fign}Wollenhaupt.csv',give_names=True)
-
-    #Opening Model data
-    modelfile = reader(open(path))
-
-    #Interpolating Original Data to interpolated curve functions in a dictionary
-    funcdict = {}
-    for fig_name in fig_names:
-        funcdict[f'{fig_name}'] = interp1d(fig_dict[f'{fig_name} Xdata'],fig_dict[f'{fig_name} Ydata'])
+    figdata = load_figuredata(f'Data/Fig{fign}Wollenhaupt.csv')
 
     launchernames = ['Ariane62','Ariane64','Soyuz']
-    #Turning modelfile into a dictionary with all relevant data
-    #(bit annoying because the modelfile has different launchers below eachother instead of different columns)
-    counter = -1
-    modeldict = {}
-    for row in modelfile:
-        if 'Isp' in row[0]:
-            counter +=1
-            datalist = []
-        else:
-            Isp  = float(row[0])
-            Rinj = float(row[1])
-            Msep = float(row[2])
-            Teff = float(row[3])
-            datalist.append([Isp, Rinj, Msep, Teff])
-            modeldict[f'{launchernames[counter]}'] = datalist
 
     if erroronly == True:
         fig2, ax4 = plt.subplots()
@@ -231,33 +147,14 @@ def fig4errorplot(path,inputR=False,inputM=False,erroronly=False,savefile=False)
             ax3.spines['right'].set_visible(True)
 
 
-        #Main data Loop
-        Isplist = []
-        #List will all be [0]=Inject Height,[1]=Separation Mass,[2]=Transfer Efficiency
-        modellist = [[],[],[]]
-        OGlist = [[],[],[]]
-        errorlist = [[],[],[]]
-        for data in modeldict[f'{launchername}']:
-                #Assigning Correct Values
-                Isp     = float(data[0])
-                Rinj    = float(data[1])
-                Msep    = float(data[2])
-                Teff    = float(data[3])
-                #Assigning the previously interpolated functions (only one inject height, same for all launchers)
-                Rfunc   = funcdict[f'Inject Height']
-                Mfunc   = funcdict[f'Sep. Mass {launchername}']
-                Sfunc   = funcdict[f'Trans. Eff. {launchername}']
-
-                #Setting up iterables
-                variables   = [Rinj, Msep, Teff]
-                ilist       = [0,1,2]
-                functions   = [Rfunc,Mfunc,Sfunc]
-                #Append Values to the right lists
-                for variable,i,func in zip(variables,ilist,functions):
-                    modellist[i].append(variable)
-                    OGlist[i].append(func(Isp))
-                    errorlist[i].append((variable-func(Isp))/func(Isp)*100.)
-                Isplist.append(Isp)
+        #Main data, rows will all be [0]=Inject Height,[1]=Separation Mass,[2]=Transfer Efficiency
+        modeldata   = modeldict[launchername]
+        Isplist     = modeldata[:,0]
+        modellist   = modeldata[:,1:].T
+        #Original data interpolated at all model Isps at once (only one inject height, same for all launchers)
+        OGlist      = figdata.interpolate(Isplist,['Inject Height',f'Sep. Mass {launchername}',f'Trans. Eff. {launchername}'])
+        errorlist   = (modellist-OGlist)/OGlist*100.
+        ilist       = [0,1,2]
         #Setting up iterables
         colors      = ['g','k','orange']
         labels      = ['Inject Height','Sep. Mass','Trans. Eff.']
@@ -287,8 +184,6 @@ def fig4errorplot(path,inputR=False,inputM=False,erroronly=False,savefile=False)
     if erroronly == True:
         fig2.legend(loc='upper right',bbox_to_anchor= (.95,0.85))
         plt.show()
-    if savefile == False:
-        os.remove(path)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,148 @@
+from numpy import asarray, broadcast_arrays, exp, log, floor, ceil, zeros, ones, where, maximum, any as npany
+
+#Above this mass fraction spent per cycle the series in CycleCount is no longer used and the cycles are iterated instead
+U_MAX = 0.3
+#Below this mass fraction the series of F is accurate to machine precision, larger fractions are first stepped down to it
+U_SERIES = 0.04
+
+
+def CycleCountLoop(t_dc,T_0,DV_tot,v_e,M_i=150.,givederiv=False):
+    '''Amount of charge/discharge cycles needed to deliver DV_tot, found by stepping through the cycles one by one.
+    Same iteration as the original while-loops, but for arrays of discharge times (and other inputs) at once.
+
+    t_dc    = Cycle Discharging time in [s]
+    T_0     = Thrust of propulsion system in [N]
+    DV_tot  = Total DeltaV required in [m/s]
+    v_e     = Exhaust Velocity of Thruster in [m/s]
+    M_i     = Initial Total Mass in [kg]
+    givederiv= if True also returns the derivative of cycle with respect to t_dc
+
+    output:
+    cycle   = (fractional) amount of cycles, including the linear overshoot correction
+    '''
+    t_dc, T_0, DV_tot, v_e, Mi = broadcast_arrays(*(asarray(x, dtype=float) for x in (t_dc, T_0, DV_tot, v_e, M_i)))
+    Mi      = Mi.copy()
+    DV      = zeros(t_dc.shape)
+    DVi     = ones(t_dc.shape)
+    cycle   = zeros(t_dc.shape)
+    #Derivatives with respect to t_dc, carried along with the iteration
+    dMi     = zeros(t_dc.shape)
+    dDV     = zeros(t_dc.shape)
+    dDVi    = zeros(t_dc.shape)
+    #Always do the first cycle, like the while-loops
+    active  = ones(t_dc.shape, dtype=bool)
+
+    while npany(active):
+        dDVi    = where(active, T_0/Mi-(T_0*t_dc/Mi**2)*dMi, dDVi)
+        DVi     = where(active, (T_0/Mi)*t_dc, DVi)     #Increase in DeltaV
+        dDV     = where(active, dDV+dDVi, dDV)
+        DV      = where(active, DV+DVi, DV)             #Total DeltaV delivered
+        dMi     = where(active, (dMi-Mi*dDVi/v_e)*exp(-DVi/v_e), dMi)
+        Mi      = where(active, Mi*exp(-DVi/v_e), Mi)   #Current Total Mass
+        cycle   += active                               #Cycle Number
+        active  = DV<DV_tot
+
+    #linear overshoot correction
+    cycle -= (DV-DV_tot)/DVi
+    if givederiv == True:
+        return cycle, -dDV/DVi+(DV-DV_tot)*dDVi/DVi**2
+    return cycle
+
+
+def _abel_series(u):
+    '''Series of the function F with F(u*exp(u)) = F(u)+1, so every cycle adds exactly one to F'''
+    return -1/u + 0.5*log(u) - u/6. + u**2/16. - 19*u**3/540. + u**4/48. - 41*u**5/4200. + 37*u**6/103680. + 18349*u**7/3175200.
+
+
+def _abel_series_derivative(u):
+    return 1/u**2 + 0.5/u - 1/6. + u/8. - 19*u**2/180. + u**3/12. - 41*u**4/840. + 37*u**5/17280. + 18349*u**6/453600.
+
+
+def _abel(u):
+    '''F and its derivative for mass fractions up to U_MAX. Larger fractions are stepped back one cycle at a time
+    (w*exp(w) = u, solved with Newton iterations) until the series is accurate, every step back lowers F by one.'''
+    w       = u.copy()
+    steps   = zeros(u.shape)
+    dw      = ones(u.shape)
+    while npany(w>U_SERIES):
+        back    = w>U_SERIES
+        v       = w*exp(-w)
+        for i in range(3):
+            v  -= (v*exp(v)-w)/(exp(v)*(1+v))
+        dw      = where(back, dw/(exp(v)*(1+v)), dw)
+        w       = where(back, v, w)
+        steps  += back
+    return _abel_series(w)+steps, _abel_series_derivative(w)*dw
+
+
+def _abel_inverse(F):
+    '''Mass fraction u with F(u) = F, from the series at a fraction below U_SERIES and the cycles forward from there'''
+    steps   = maximum(ceil(F-_abel_series(U_SERIES)), 0.)
+    #Newton iterations on the series, starting at the leading term
+    w       = 1/(steps-F)
+    for i in range(4):
+        w  -= (_abel_series(w)-F+steps)/_abel_series_derivative(w)
+    while npany(steps>0):
+        w       = where(steps>0, w*exp(w), w)
+        steps  -= 1
+    return w
+
+
+def CycleCount(t_dc,T_0,DV_tot,v_e,M_i=150.,givederiv=False):
+    '''Amount of charge/discharge cycles needed to deliver DV_tot in closed form.
+
+    Each cycle delivers an impulse T_0*t_dc, so DVi = T_0*t_dc/Mi and the mass drops by the factor exp(-DVi/v_e).
+    With u = T_0*t_dc/(v_e*Mi) every cycle maps u to u*exp(u), so the amount of cycles between two masses is the
+    difference of the function F with F(u*exp(u)) = F(u)+1. F is evaluated with its series expansion below U_SERIES,
+    larger fractions are stepped back to it cycle by cycle, so it is accurate to round-off up to U_MAX. That gives
+    the amount of full cycles and the mass after them, after which the last cycle gets the same linear overshoot
+    correction as the while-loops.
+    The cost does not depend on the amount of cycles and inputs can be scalars or arrays, for example many
+    battery/solar mass splits at once. Where a single cycle spends more than U_MAX of the mass CycleCountLoop is used.
+
+    Inputs and outputs as in CycleCountLoop.
+    '''
+    t_dc, T_0, DV_tot, v_e, M_i = broadcast_arrays(*(asarray(x, dtype=float) for x in (t_dc, T_0, DV_tot, v_e, M_i)))
+    M_f     = M_i*exp(-DV_tot/v_e)      #Final Total Mass in [kg]
+    u_0     = T_0*t_dc/(v_e*M_i)        #Mass fraction spent in the first cycle
+    u_f     = T_0*t_dc/(v_e*M_f)        #Mass fraction spent in a cycle at the final mass
+
+    closed  = u_f<U_MAX
+    u_0     = where(closed, u_0, 0.1)
+    u_f     = where(closed, u_f, 0.1)
+
+    #Amount of full cycles before DV_tot is reached
+    F_0, dF_0 = _abel(u_0)
+    k       = floor(_abel(u_f)[0]-F_0)
+    #Mass fraction after k cycles (exactly u_0 without a full cycle, so the overshoot correction has no round-off)
+    u_k     = where(k>0, _abel_inverse(F_0+k), u_0)
+
+    #linear overshoot correction of the last cycle, DeltaV after k cycles follows from the rocket equation
+    DV_k    = v_e*log(u_k/u_0)
+    cycle   = k+(DV_tot-DV_k)/(v_e*u_k)
+
+    #Derivative with respect to t_dc, u_0 is proportional to t_dc and F(u_k)-F(u_0) = k is constant
+    du_0    = u_0/t_dc
+    du_k    = dF_0*du_0/_abel(u_k)[1]
+    dcycle  = -(du_k/u_k-du_0/u_0)/u_k-(cycle-k)*du_k/u_k
+
+    if not closed.all():
+        cycle[~closed], dcycle[~closed] = CycleCountLoop(t_dc[~closed], T_0[~closed], DV_tot[~closed], v_e[~closed], M_i[~closed], givederiv=True)
+    if cycle.ndim == 0:
+        cycle, dcycle = float(cycle), float(dcycle)
+    if givederiv == True:
+        return cycle, dcycle
+    return cycle
+
+
+if __name__ == '__main__':
+    import time
+    from numpy import linspace
+    t_dc = linspace(500., 50000., 200)
+    start_time = time.time()
+    loop = CycleCountLoop(t_dc, 0.015, 1000., 9810.)
+    print(f"Loop executed in {(time.time()-start_time)} seconds")
+    start_time = time.time()
+    closed = CycleCount(t_dc, 0.015, 1000., 9810.)
+    print(f"Closed form executed in {(time.time()-start_time)} seconds")
+    print('Maximum relative difference', abs((closed-loop)/loop).max())
@@ -1,21 +1,78 @@
-from OHBModel import OHBModel
+from ParallelSweep import case_tasks, run_tasks
 from csv import writer
-import matplotlib.pyplot as plt
-from csvtodict import csvtodict
-from scipy.interpolate import interp1d
-
-
-
-def create_fig3data(savepath,Isprange=(260,3600),step=20,inputR=False,inputM=False,graph=True):
+from figuredata import load_figuredata
+import numpy as np
+
+
+def _case_data(cases,Isps,processes,chunksize):
+    '''Evaluates the figure cases with the sweep engine of ParallelSweep.
+    cases is a dictionary of (launcher, transfer time [days], Given Injection Height, Given Separation Mass) per case.
+    Returns a dictionary with an array per case, with columns Isp, Injection Height, Separation Mass and Transfer Efficiency'''
+    tasks = (task for (launcher, tdays, Given_Rinj, Given_Msep) in cases.values()
+             for task in case_tasks('30', launcher, np.full(len(Isps), float(tdays)), Isps, R_inj_v=Given_Rinj, M_sep_v=Given_Msep, chunksize=chunksize))
+    rows = [row[3:] for chunk in run_tasks(tasks, processes) for row in chunk]
+    #Every case adds one row per Isp, in the order of the cases
+    return {case: np.array(rows[i*len(Isps):(i+1)*len(Isps)], dtype=float) for i, case in enumerate(cases)}
+
+
+def fig3data(Isprange=(260,3600),step=20,inputR=False,inputM=False,processes=1,chunksize=1000):
+    '''Model data of Wollenhaupt Figure 3 (Soyuz, multiple transfer times) for a certain Isp Range.
+    With or without both Injection Height and Separation Mass of the original data as inputs.
+    processes and chunksize are passed on to the sweep engine (see ParallelSweep.run_tasks and case_tasks).
+    Returns a dictionary with an array per transfer time in days, with columns Isp, Injection Height, Separation Mass and Transfer Efficiency'''
+    (start, stop) = Isprange
+    Isps = np.arange(start,stop,step,dtype=float)
+    #Loading Original Data to use the injection height and separation mass input.
+    OGdata = load_figuredata('Data/Fig3Wollenhaupt.csv')
+    cases = {}
+    for tdays in [90,180,360]:
+        Given_Rinj = OGdata.interpolate(Isps,[f'Inject Height {tdays} d'])[0] if inputR == True else None
+        Given_Msep = OGdata.interpolate(Isps,[f'Sep. Mass {tdays} d'])[0] if inputM == True else None
+        launcher   = None if inputM == True else 'Soyuz'
+        cases[tdays] = (launcher, tdays, Given_Rinj, Given_Msep)
+    return _case_data(cases, Isps, processes, chunksize)
+
+
+def fig4data(Isprange=(260,3600),step=20,inputR=False,inputM=False,processes=1,chunksize=1000):
+    '''Model data of Wollenhaupt Figure 4 (multiple launchers, 90 days transfer time) for a certain Isp Range.
+    processes and chunksize are passed on to the sweep engine (see ParallelSweep.run_tasks and case_tasks).
+    Returns a dictionary with an array per launcher, with columns Isp, Injection Height, Separation Mass and Transfer Efficiency'''
+    (start, stop) = Isprange
+    Isps = np.arange(start,stop,step,dtype=float)
+    OGdata = load_figuredata('Data/Fig4Wollenhaupt.csv')
+    cases = {}
+    for launcher in ['Ariane62','Ariane64','Soyuz']:
+        #Only one inject height in the original data, same for all launchers
+        Given_Rinj = OGdata.interpolate(Isps,['Inject Height'])[0] if inputR == True else None
+        Given_Msep = OGdata.interpolate(Isps,[f'Sep. Mass {launcher}'])[0] if inputM == True else None
+        launch     = None if inputM == True else launcher
+        cases[launcher] = (launch, 90, Given_Rinj, Given_Msep)
+    return _case_data(cases, Isps, processes, chunksize)
+
+
+def write_figdata(savepath,data,suffixes):
+    '''Writes figure data (as returned by fig3data or fig4data) to a csv file, blocks of each case below each other with their own header row.
+    suffixes gives the header suffix of each case (Example: {90:'90 d'} or {'Soyuz':'Soyuz'})'''
+    with open(savepath,'w',newline='') as csvfile:
+        csvwrite = writer(csvfile)
+        for case, block in data.items():
+            suffix = suffixes[case]
+            csvwrite.writerow([f'Isp {case}',f'Inject Height {suffix}',f'Sep. Mass {suffix}',f'Trans. Eff. {suffix}'])
+            csvwrite.writerows(block.tolist())
+
+
+def create_fig3data(savepath=None,Isprange=(260,3600),step=20,inputR=False,inputM=False,graph=True,processes=1,chunksize=1000):
     '''Recreate Wollenhaupt Figure 3 multi transfer time soyuz data for the current model for a certain Isp Range.
     With or without both Injection Height and Separation Mass as inputs.
-    Saves the data in savepath '''
-    #Open File to Write Data
-    path = savepath
-    csvwrite = writer(open(path,'w+'))
-    #Set-Up plot 1
+    Saves the data in savepath (if given) and returns it (see fig3data)'''
+    data = fig3data(Isprange,step,inputR,inputM,processes,chunksize)
+    if savepath is not None:
+        write_figdata(savepath,data,{tdays:f'{tdays} d' for tdays in data})
 
     if graph == True:
+        #Plotting only imported when needed, so the figure data can be made without matplotlib
+        import matplotlib.pyplot as plt
+        #Set-Up plot 1
         fig, ax1 = plt.subplots()
         ax1.set_xlabel('Specific Impulse [s]')
         ax1.set_ylabel('Injection Height [km], Seperation Mass [kg]',)
@@ -25,56 +82,9 @@ def create_fig3data(savepath,Isprange=(260,3600),step=20,inputR=False,inputM=Fal
         fig.suptitle('Example MEO Transfer on an Soyuz - Model')
         linedict = {}
 
-    #Loading Original Data to use the injection height input.
-    OGdatapath = 'Data/Fig3Wollenhaupt.csv'
-    OGdatadict, OGnames = csvtodict(OGdatapath,give_names=True)
-
-
-
-    #Loop over the 3 different transfertime cases
-    for tdays,sign in [(90,'-'),(180,':'),(360,'--')]:
-
-
-        Rlist = []
-        Mlist = []
-        Slist = []
-        Ilist = []
-        #Writing Column Names
-        csvwrite.writerow([f'Isp {tdays}',f'Inject Height {tdays} d',f'Sep. Mass {tdays} d',f'Trans. Eff. {tdays} d'])
-
-        #Creating interpolated function from original injection height data
-        OGIsps = OGdatadict[f'Inject Height {tdays} d Xdata']
-        OGRinjs = OGdatadict[f'Inject Height {tdays} d Ydata']
-        OGIsp_to_R_func = interp1d(OGIsps,OGRinjs)
-
-        #Creating interpolated function from original sep mass data
-        OGIspMs  = OGdatadict[f'Sep. Mass {tdays} d Xdata']
-        OGMseps  = OGdatadict[f'Sep. Mass {tdays} d Ydata']
-        OGIsp_to_M_func = interp1d(OGIspMs,OGMseps)
-
-        (start, stop) = Isprange
-        for Isp in range(start,stop,step):
-            #Calculating Rinj for Isp from original curve
-            if inputR == True:
-                Given_Rinj  = OGIsp_to_R_func(Isp)
-            else:
-                Given_Rinj  = None
-            #Calculating Msep for Isp from original curve
-            if inputM == True:
-                Given_Msep  = OGIsp_to_M_func(Isp)
-                launcher   = None
-            else:
-                Given_Msep  = None
-                launcher    = 'Soyuz'
-
-            #Running Model
-            Ri, Mi, Si = OHBModel(I_sp=Isp, P_sat=2500.,t_trans=tdays*24*3600.,M_dry=1000.,R_f=23222.*10**3,launcher=launcher,R_inj_v=Given_Rinj,M_sep_v=Given_Msep)
-            Rlist.append(Ri)
-            Mlist.append(Mi)
-            Slist.append(Si)
-            Ilist.append(Isp)
-            csvwrite.writerow([Isp,Ri,Mi,Si])
-        if graph == True:
+        #Loop over the 3 different transfertime cases
+        for tdays,sign in [(90,'-'),(180,':'),(360,'--')]:
+            Ilist, Rlist, Mlist, Slist = data[tdays].T
             linedict[f"lineR{tdays}"], = ax1.plot(Ilist,Rlist,'g',linestyle=sign)
             linedict[f"lineM{tdays}"], = ax1.plot(Ilist,Mlist,'k',linestyle=sign)
             linedict[f"lineS{tdays}"], = ax3.plot(Ilist,Slist,'darkorange',linestyle=sign)
@@ -83,7 +93,6 @@ def create_fig3data(savepath,Isprange=(260,3600),step=20,inputR=False,inputM=Fal
             linedict[f"lineM{tdays}"].set_label(f'Separation Mass {tdays} days')
             linedict[f"lineS{tdays}"].set_label(f'Transfer Efficiency {tdays} days')
 
-    if graph == True:
         #Set Correct Legend Order
         legendlist = []
         for i,days in [(0,90),(1,180),(2,360)]:
@@ -91,13 +100,19 @@ def create_fig3data(savepath,Isprange=(260,3600),step=20,inputR=False,inputM=Fal
                 legendlist.append(linedict[f"line{a}{days}"])
         #Create Legends with ordered handles and give location
         fig.legend(handles=legendlist,loc='lower right',bbox_to_anchor=(0.88,0.11),ncol=3)
-        if graph == True:
-            plt.show()
+        plt.show()
+    return data
 
 
-def create_fig4data(savepath,Isprange=(260,3600),step=20,inputR=False,inputM=False,graph=True):
+def create_fig4data(savepath=None,Isprange=(260,3600),step=20,inputR=False,inputM=False,graph=True,processes=1,chunksize=1000):
+    '''Recreate Wollenhaupt Figure 4 launcher comparison data for the current model for a certain Isp Range.
+    Saves the data in savepath (if given) and returns it (see fig4data)'''
+    data = fig4data(Isprange,step,inputR,inputM,processes,chunksize)
+    if savepath is not None:
+        write_figdata(savepath,data,{launcher:launcher for launcher in data})
 
     if graph == True:
+        import matplotlib.pyplot as plt
         #Second Figure Set- up
         fig2, axx = plt.subplots()
         axx2 = axx.twinx()
@@ -106,56 +121,18 @@ def create_fig4data(savepath,Isprange=(260,3600),step=20,inputR=False,inputM=Fal
         axx.set_ylabel('Injection Height [km],Separation Mass[kg]')
         axx2.set_ylabel('Transfer Efficiency [%]')
 
-    csvwrite2 = writer(open(savepath,'w+'))
-    #Loading Original Data to use the injection height input.
-    OGdatapath2 = 'Data/Fig4Wollenhaupt.csv'
-    OGdatadict2, OGnames2 = csvtodict(OGdatapath2,give_names=True)
-
-    for launcher, sign2 in [('Ariane62','--'),('Ariane64',':'),('Soyuz','-')]:
-        datalist = [[],[],[]]
-        Ilist2 = []
-        csvwrite2.writerow([f'Isp {launcher}',f'Inject Height {launcher}',f'Sep. Mass {launcher}',f'Trans. Eff. {launcher}'])
-
-        OGIsps2 = OGdatadict2[f'Inject Height Xdata']
-        OGRinjs2 = OGdatadict2[f'Inject Height Ydata']
-        OGIsp_to_R_func2 = interp1d(OGIsps2,OGRinjs2)
-
-        #Creating interpolated function from original sep mass data
-        OGIspMs  = OGdatadict2[f'Sep. Mass {launcher} Xdata']
-        OGMseps  = OGdatadict2[f'Sep. Mass {launcher} Ydata']
-        OGIsp_to_M_func = interp1d(OGIspMs,OGMseps)
-
-        (start,stop) = Isprange
-        for Isp in range(start,stop,step):
-            #Calculating Rinj for Isp from original curve
-            if inputR == True:
-                Given_Rinj  = OGIsp_to_R_func2(Isp)
-            else:
-                Given_Rinj  = None
-            #Calculating Msep for Isp from original curve
-            if inputM == True:
-                Given_Msep  = OGIsp_to_M_func(Isp)
-                launch   = None
-            else:
-                Given_Msep  = None
-                launch = launcher
-            Ri, Mi, Si = OHBModel(I_sp=Isp, P_sat=2500.,t_trans=90*24*3600.,M_dry=1000.,R_f=23222.*10**3,launcher=launch,R_inj_v=Given_Rinj,M_sep_v=Given_Msep)
-            datalist[0].append(Ri)
-            datalist[1].append(Mi)
-            datalist[2].append(Si)
-            Ilist2.append(Isp)
-            csvwrite2.writerow([Isp,Ri,Mi,Si])
-        if graph == True:
-            fig2dict[f'Sline{launcher}'], = axx2.plot(Ilist2,datalist[2], linestyle=sign2,color='darkorange',label=f'Transfer Efficiency {launcher}')
-            fig2dict[f'Mline{launcher}'], = axx.plot(Ilist2,datalist[1], linestyle=sign2,color='k',label=f'Separation Mass {launcher}')
-    if graph == True:
+        for launcher, sign2 in [('Ariane62','--'),('Ariane64',':'),('Soyuz','-')]:
+            Ilist2, Rlist2, Mlist2, Slist2 = data[launcher].T
+            fig2dict[f'Sline{launcher}'], = axx2.plot(Ilist2,Slist2, linestyle=sign2,color='darkorange',label=f'Transfer Efficiency {launcher}')
+            fig2dict[f'Mline{launcher}'], = axx.plot(Ilist2,Mlist2, linestyle=sign2,color='k',label=f'Separation Mass {launcher}')
 
-        Rline, = axx.plot(Ilist2,datalist[0],'g',label='Injection Height')
+        Rline, = axx.plot(Ilist2,Rlist2,'g',label='Injection Height')
         handles2 = [Rline,fig2dict['SlineAriane62'],fig2dict['SlineAriane64'],fig2dict['SlineSoyuz'],fig2dict['MlineAriane62'],fig2dict['MlineAriane64'],fig2dict['MlineSoyuz']]
 
         fig2.legend(handles=handles2,loc='upper right',bbox_to_anchor=(0.88,0.88),ncol=2)
         fig2.suptitle('Comparison of Different Launchers - Model')
         plt.show()
+    return data
 
 if __name__ == '__main__':
     create_fig3data('Data/fig4datatest.csv',inputR=True,inputM=True,graph=False)
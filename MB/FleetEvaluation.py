@@ -0,0 +1,68 @@
+from openmdao.api import Problem, Group
+from NightCycle import MBOne
+from SatCatalog import LoadCatalog
+from multiprocessing import Pool
+from contextlib import redirect_stdout
+from io import StringIO
+from csv import writer
+
+#Problem of a worker process, set up once and reused for every satellite the worker evaluates
+_problem = None
+
+
+def _worker_init(M_sa, M_batt):
+    global _problem
+    _problem = Problem()
+    _problem.model = Group()
+    _problem.model.add_subsystem('sat', MBOne(), promotes=['*'])
+    with redirect_stdout(StringIO()):
+        _problem.setup()
+    _problem['M_sa'] = M_sa
+    _problem['M_batt'] = M_batt
+
+
+def _evaluate(sat):
+    '''Result row of one satellite, with the error message as status if it cannot be evaluated'''
+    try:
+        _problem.model.sat.set_satellite(sat)
+        #MBOne prints status messages per satellite, which would flood the output of a whole fleet
+        with redirect_stdout(StringIO()):
+            _problem.run_model()
+    except Exception as error:
+        return [sat.SatelliteName, sat.SatClass, '', '', '', '', str(error)]
+    return [sat.SatelliteName, sat.SatClass, float(_problem['t_tot'][0]), float(_problem['M_batt,min'][0]),
+            float(_problem['M_d'][0]), float(_problem['M_p'][0]), 'OK']
+
+
+def evaluate_fleet(savepath, path='SatData.json', M_sa=100., M_batt=20., processes=None, chunksize=16):
+    '''Evaluates NightCycle.MBOne for every satellite of a catalog on a pool of worker processes and writes one result table.
+    Every worker sets up its Problem once and only switches the satellite in between runs.
+
+    savepath    = pathstring of the output csv file
+    path        = pathstring of the satellite catalog (same format as SatData.json)
+    M_sa, M_batt= Solar Array and Battery Mass in [kg] used for every satellite
+    processes   = Amount of worker processes, defaults to the amount of cpus. With 1 no pool is started.
+    chunksize   = Amount of satellites sent to a worker at once
+
+    returns the result rows, in catalog order
+    '''
+    satellites = list(LoadCatalog(path).values())
+    if processes == 1:
+        _worker_init(M_sa, M_batt)
+        rows = [_evaluate(sat) for sat in satellites]
+    else:
+        with Pool(processes, initializer=_worker_init, initargs=(M_sa, M_batt)) as pool:
+            rows = pool.map(_evaluate, satellites, chunksize=chunksize)
+    with open(savepath, 'w', newline='') as csvfile:
+        csvwrite = writer(csvfile)
+        csvwrite.writerow(['SatelliteName', 'Classification', 'Transfer Time [s]', 'Minimal Battery Mass [kg]', 'Left over Mass [kg]', 'Propellant Mass [kg]', 'Status'])
+        csvwrite.writerows(rows)
+    return rows
+
+
+if __name__ == '__main__':
+    import time
+    start_time = time.time()
+    for row in evaluate_fleet('Data/Output/fleet.csv'):
+        print(row)
+    print(f"executed in {(time.time()-start_time)} seconds")
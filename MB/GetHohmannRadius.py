@@ -1,19 +1,55 @@
-from openmdao.api import Group, Problem, NewtonSolver, ScipyKrylov
+from openmdao.api import Group, Problem, NewtonSolver, DirectSolver
+from numpy import asarray, broadcast_arrays
 from implicit_radius import RadiusComp
+from collections import OrderedDict
+
+
+class HohmannRadiusSolver(object):
+    """Solves the final radius for given initial radii and DeltaV's with an OpenMDAO Problem that is set up only once.
+    The Problems for the last maxsize amounts of (DeltaV, R_i) pairs are kept, so further solves only re-run the Newton solver."""
+
+    def __init__(self, maxsize=4):
+        self.maxsize = maxsize
+        self.problems = OrderedDict()
+
+    def problem(self, n):
+        """Returns the set up Problem that solves n (DeltaV, R_i) pairs together"""
+        if n in self.problems:
+            #Most recently used last, the least recently used Problem is removed first
+            self.problems.move_to_end(n)
+            return self.problems[n]
+        p = Problem()
+        p.model = model = Group()
+        model.add_subsystem('radiusconverge',RadiusComp(n=n),promotes=['*'])
+        model.nonlinear_solver = NewtonSolver(maxiter = 20, iprint= 0, atol =1e-10, rtol=1e-12, solve_subsystems=False)
+        model.linear_solver = DirectSolver()
+        p.setup()
+        self.problems[n] = p
+        if len(self.problems) > self.maxsize:
+            self.problems.popitem(last=False)
+        return p
+
+    def solve(self, DV_i, R_i):
+        """Final radius for a single DeltaV and initial radius"""
+        return self.solve_batch([DV_i], [R_i])[0]
+
+    def solve_batch(self, DV_i, R_i):
+        """Final radii for arrays of DeltaV's and initial radii, all solved in one Newton iteration"""
+        DV_i, R_i = broadcast_arrays(asarray(DV_i, dtype=float).ravel(), asarray(R_i, dtype=float).ravel())
+        p = self.problem(len(DV_i))
+        p['DeltaV'] = DV_i
+        p['R_i'] = R_i
+        p.run_model()
+        return p['R_f'].copy()
+
+
+_solver = HohmannRadiusSolver()
+
 
 def GetHohmannRadius(DV_i,R_i):
     """Function to get the final radius when given a initial radius and DeltaV (change)"""
-
-    p = Problem()
-    p.model = model = Group()
-    model.add_subsystem('radiusconverge',RadiusComp(),promotes=['*'])
-    model.nonlinear_solver = NewtonSolver(maxiter = 20, iprint= 0, atol =1e-10, rtol=1e-12)
-    model.linear_solver = ScipyKrylov()
-    p.setup()
-    p['DeltaV'] = DV_i
-    p['R_i'] = R_i
-    p.run_model()
-    return p['R_f']
+    return _solver.solve_batch(DV_i, R_i)
 
 if __name__ == '__main__':
     print(GetHohmannRadius(DV_i = 100 , R_i=6778000 ))
+    print(_solver.solve_batch([1., 10., 100.], 6778000.))
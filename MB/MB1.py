@@ -9,6 +9,9 @@ class MB1Comp(ExplicitComponent):
         self.add_output('C_batt')
         self.add_output('P_sa')
 
+        self.declare_partials('C_batt','M_batt')
+        self.declare_partials('P_sa','M_sa')
+
     def compute(self, inputs, outputs):
         G_sc= 1361
         eta_sa= 0.375
@@ -19,7 +22,14 @@ class MB1Comp(ExplicitComponent):
         outputs['P_sa']    = A_sa*G_sc*eta_sa
         outputs['C_batt']  = inputs['M_batt']*E_sp
 
-        self.declare_partials('*','*', method='fd')
+    def compute_partials(self, inputs, partials):
+        G_sc= 1361
+        eta_sa= 0.375
+        Z_sa= 2.8
+        E_sp = (65*3600)
+
+        partials['P_sa','M_sa']     = G_sc*eta_sa/Z_sa
+        partials['C_batt','M_batt'] = E_sp
 
 #Verification Check
 if __name__ == '__main__':
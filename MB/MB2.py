@@ -12,6 +12,10 @@ class MB2Comp(ExplicitComponent):
         self.add_output('t_c')
         self.add_output('t_dc')
 
+        #M_d does not depend on the inputs
+        self.declare_partials('t_c',['P_sa','C_batt'])
+        self.declare_partials('t_dc','C_batt')
+
     def compute(self, inputs, outputs):
         M_0 = 150
         R_0 = 6778000
@@ -36,7 +40,14 @@ class MB2Comp(ExplicitComponent):
         outputs['t_c'] = inputs['C_batt']/(inputs['P_sa']-P_req)
         outputs['t_dc'] = inputs['C_batt']*eta_dis/(P_th)#-(inputs['P_sa']-P_req))
 
-        self.declare_partials('*','*', method='fd')
+    def compute_partials(self, inputs, partials):
+        P_req = 100
+        eta_dis = 0.85
+        P_th = 250
+
+        partials['t_c','C_batt'] = 1/(inputs['P_sa']-P_req)
+        partials['t_c','P_sa'] = -inputs['C_batt']/(inputs['P_sa']-P_req)**2
+        partials['t_dc','C_batt'] = eta_dis/P_th
 
 
 if __name__ == '__main__':
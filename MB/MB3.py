@@ -1,6 +1,6 @@
 from openmdao.api import ExplicitComponent
 from math import sqrt
-from numpy import exp
+from CycleIntegrator import CycleCount
 
 class MB3Comp(ExplicitComponent):
 
@@ -10,11 +10,11 @@ class MB3Comp(ExplicitComponent):
 
         self.add_output('t_tot')
 
+        self.declare_partials('t_tot',['t_c','t_dc'])
+
     def compute(self, inputs, outputs):
         T_0     = 0.015
-        Mi      = 150
-        DV      = 0
-        cycle   = 0
+        M_i     = 150
 
         R_0 = 6778000
         R_f = 7578000
@@ -23,17 +23,26 @@ class MB3Comp(ExplicitComponent):
 
         DV_tot  = sqrt(mu/R_0)*(sqrt(2*R_f/(R_f+R_0))-1)+sqrt(mu/R_f)*(1-sqrt(2*R_0/(R_f+R_0)))
 
-        while DV<DV_tot:
-            # print (DV)
-            DVi     = (T_0/Mi)*inputs['t_dc']
-            DV      += DVi
-            Mi      *= exp(-DVi/v_e)
-            cycle   += 1
-
-        #linear overshoot correction
-        cycle -= (DV-DV_tot)/DVi
+        #Amount of charging, discharging cycles (closed form, see CycleIntegrator)
+        cycle   = CycleCount(inputs['t_dc'],T_0,DV_tot,v_e,M_i=M_i)
         outputs['t_tot'] = (inputs['t_c']+inputs['t_dc'])*cycle
 
+    def compute_partials(self, inputs, partials):
+        T_0     = 0.015
+        M_i     = 150
+
+        R_0 = 6778000
+        R_f = 7578000
+        mu = 398600*10**9
+        v_e = 9810
+
+        DV_tot  = sqrt(mu/R_0)*(sqrt(2*R_f/(R_f+R_0))-1)+sqrt(mu/R_f)*(1-sqrt(2*R_0/(R_f+R_0)))
+
+        #Cycle count and its derivative to t_dc, including the change of the linear overshoot correction
+        cycle, dcycle = CycleCount(inputs['t_dc'],T_0,DV_tot,v_e,M_i=M_i,givederiv=True)
+        partials['t_tot','t_c']  = cycle
+        partials['t_tot','t_dc'] = cycle+(inputs['t_c']+inputs['t_dc'])*dcycle
+
 
 if __name__ == '__main__':
     from openmdao.api import Problem, Group
@@ -1,5 +1,6 @@
 from math import sqrt
 from numpy import exp
+from CycleIntegrator import CycleCount
 
 def MBatteryCalc(M_batt):
     '''Function that calculates and returns the total orbit raising time
@@ -50,19 +51,8 @@ def MBatteryCalc(M_batt):
     t_c     = C_batt/(P_sa-P_req)   #Charging time
     t_dc    = C_batt*eta_dis/P_th   #Discharging time
 
-    #Iteration setup
-    Mi      = 150
-    DV      = 0
-    cycle   = 0
-
-    while DV<DV_tot:
-            DVi     = (T_0/Mi)*t_dc
-            DV      += DVi
-            Mi      *= exp(-DVi/v_e)
-            cycle   += 1
-
-    #linear overshoot correction
-    cycle -= (DV-DV_tot)/DVi #total amount of charging, discharging cycles
+    #Amount of charging, discharging cycles (closed form, see CycleIntegrator)
+    cycle   = CycleCount(t_dc,T_0,DV_tot,v_e,M_i=150)
 
     t_tot = (t_c+t_dc)*cycle #total orbit manouvre time
 
@@ -118,19 +108,8 @@ def MSolarCalc(M_sa):
     t_c     = C_batt/(P_sa-P_req)   #Charging time
     t_dc    = C_batt*eta_dis/P_th   #Discharging time
 
-    #iteration setup
-    Mi      = 150
-    DV      = 0
-    cycle   = 0
-
-    while DV<DV_tot:
-            DVi     = (T_0/Mi)*t_dc
-            DV      += DVi
-            Mi      *= exp(-DVi/v_e)
-            cycle   += 1
-
-    #linear overshoot correction
-    cycle -= (DV-DV_tot)/DVi
+    #Amount of charging, discharging cycles (closed form, see CycleIntegrator)
+    cycle   = CycleCount(t_dc,T_0,DV_tot,v_e,M_i=150)
 
     t_tot = (t_c+t_dc)*cycle
 
@@ -2,19 +2,45 @@ from openmdao.api import Group, IndepVarComp, ExecComp
 from MB1 import MB1Comp
 from MB2 import MB2Comp
 from MB3 import MB3Comp
+from Memoize import MemoizedComponent
+
+
+#Versions of the components that do not evaluate the same point twice (see Memoize)
+class CachedMB1Comp(MemoizedComponent, MB1Comp):
+    pass
+
+class CachedMB2Comp(MemoizedComponent, MB2Comp):
+    pass
+
+class CachedMB3Comp(MemoizedComponent, MB3Comp):
+    pass
+
 
 class MBGroup(Group):
 
+    def initialize(self):
+        self.options.declare('cache_size', default=128, types=int, desc='Cached evaluations per component, 0 to switch the cache off')
+
     def setup(self):
         indeps = self.add_subsystem('indeps', IndepVarComp(), promotes=['*'])
         indeps.add_output('M_batt', 10)
         indeps.add_output('M_sa', 10)
 
-        self.add_subsystem('BattSolar', MB1Comp(), promotes = ['*'])
-        self.add_subsystem('MassTime', MB2Comp(), promotes=['*'])
-        self.add_subsystem('OrbitCycle', MB3Comp(), promotes=['*'])
+        cache_size = self.options['cache_size']
+        if cache_size > 0:
+            self.add_subsystem('BattSolar', CachedMB1Comp(cache_size=cache_size), promotes = ['*'])
+            self.add_subsystem('MassTime', CachedMB2Comp(cache_size=cache_size), promotes=['*'])
+            self.add_subsystem('OrbitCycle', CachedMB3Comp(cache_size=cache_size), promotes=['*'])
+        else:
+            self.add_subsystem('BattSolar', MB1Comp(), promotes = ['*'])
+            self.add_subsystem('MassTime', MB2Comp(), promotes=['*'])
+            self.add_subsystem('OrbitCycle', MB3Comp(), promotes=['*'])
         self.add_subsystem('Constraint1', ExecComp( 'constraint1 = M_d - (M_batt + M_sa)'),promotes=['constraint1','M_d','M_sa','M_batt'])
 
+    def cache_info(self):
+        '''Hit and miss counters of the cached components'''
+        return {comp.name: comp.cache_info() for comp in [self.BattSolar, self.MassTime, self.OrbitCycle] if isinstance(comp, MemoizedComponent)}
+
 
 
 
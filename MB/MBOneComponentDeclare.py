@@ -1,6 +1,7 @@
 from openmdao.api import ExplicitComponent
 from math import sqrt
 from numpy import exp
+from CycleIntegrator import CycleCount
 
 class MBOne(ExplicitComponent):
     def initialize(self):
@@ -59,20 +60,8 @@ class MBOne(ExplicitComponent):
         t_c     = C_batt/(P_sa-P_req)   #Cycle Charging time in [s]
         t_dc    = C_batt*eta_dis/(P_th) #Cycle Discharging time in [s]
 
-        #Iteration Setup
-        Mi      = 150
-        DV      = 0
-        cycle   = 0
-
-        #Cycle Iteration
-        while DV<DV_tot:
-            DVi     = (T_0/Mi)*t_dc     #Increase in DeltaV
-            DV      += DVi              #Total DeltaV deliverd
-            Mi      *= exp(-DVi/v_e)    #Current Total Mass
-            cycle   += 1                #Cycle Number
-
-        #linear overshoot correction
-        cycle -= (DV-DV_tot)/DVi
+        #Amount of charging, discharging cycles (closed form, see CycleIntegrator)
+        cycle   = CycleCount(t_dc,T_0,DV_tot,v_e,M_i=150)
 
         outputs['M_d'] = M_0-(M_u+M_ps+M_p)    #Left over Mass in [kg]
         outputs['t_tot'] = (t_c+t_dc)*cycle
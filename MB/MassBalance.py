@@ -1,29 +1,40 @@
-from openmdao.api import ExplicitComponent, Problem, IndepVarComp, Group, view_model, ScipyOptimizeDriver, DirectSolver, SqliteRecorder, CaseReader, ExecComp
+from openmdao.api import Problem, ScipyOptimizeDriver
 from MBGroup import MBGroup
 
-prob = Problem()
-prob.model = MBGroup()
-prob.driver = ScipyOptimizeDriver()
-prob.driver.options['optimizer'] = 'SLSQP'
-# prob.driver.options['maxiter'] = 100
-prob.driver.options['tol'] = 1e-10
-# prob.driver.options['iprint'] = 2
-prob.driver.options['debug_print'] = ['desvars', 'ln_cons', 'nl_cons', 'objs','totals']
-prob.model.add_design_var('M_sa')
-prob.model.add_design_var('M_batt')
-prob.model.add_objective('t_tot')
-prob.model.add_constraint('M_batt', lower = 1)
-prob.model.add_constraint('M_sa', lower = 1)
-prob.model.add_constraint('constraint1', equals=0)
 
-prob.setup()
-# prob.set_solver_print(level=2)
-prob.model.approx_totals()
-# view_model(prob)
-# prob.run_model()
+def MassBalanceProblem(debug_print=True):
+    '''Sets up the SLSQP battery/solar array mass optimisation of the MBGroup, minimising the total orbit raising time'''
+    prob = Problem()
+    prob.model = MBGroup()
+    prob.driver = ScipyOptimizeDriver()
+    prob.driver.options['optimizer'] = 'SLSQP'
+    # prob.driver.options['maxiter'] = 100
+    prob.driver.options['tol'] = 1e-10
+    # prob.driver.options['iprint'] = 2
+    if debug_print == True:
+        prob.driver.options['debug_print'] = ['desvars', 'ln_cons', 'nl_cons', 'objs','totals']
+    else:
+        prob.driver.options['disp'] = False
+    prob.model.add_design_var('M_sa')
+    prob.model.add_design_var('M_batt')
+    prob.model.add_objective('t_tot')
+    prob.model.add_constraint('M_batt', lower = 1)
+    prob.model.add_constraint('M_sa', lower = 1)
+    prob.model.add_constraint('constraint1', equals=0)
 
-prob.run_driver()
-print('t_tot',prob['t_tot'])
-print('M_batt',prob['M_batt'])
-print('M_sa',prob['M_sa'])
-print('M_d',prob['M_d'])
+    prob.setup()
+    return prob
+
+
+if __name__ == '__main__':
+    prob = MassBalanceProblem()
+    # prob.set_solver_print(level=2)
+    # from openmdao.api import view_model; view_model(prob)
+    # prob.run_model()
+
+    prob.run_driver()
+    print('t_tot',prob['t_tot'])
+    print('M_batt',prob['M_batt'])
+    print('M_sa',prob['M_sa'])
+    print('M_d',prob['M_d'])
+    print('Cache',prob.model.cache_info())
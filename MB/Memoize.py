@@ -0,0 +1,103 @@
+from collections import OrderedDict
+import numpy as np
+
+
+class EvaluationCache(object):
+    '''Least recently used cache of model evaluations, keyed on the input values rounded to a number of significant digits.
+
+    maxsize = Maximum amount of stored evaluations, the least recently used one is removed first
+    digits  = Significant digits of the inputs in the key, inputs that only differ further down count as the same point
+    '''
+
+    def __init__(self, maxsize=128, digits=12):
+        self.maxsize, self.digits = maxsize, digits
+        self.store  = OrderedDict()
+        self.hits   = 0
+        self.misses = 0
+
+    def key(self, values):
+        return tuple(float(f'{value:.{self.digits}g}') for value in np.ravel(values))
+
+    def get(self, key):
+        '''Returns the stored value for key (and counts the hit), or None (and counts the miss)'''
+        if key in self.store:
+            self.store.move_to_end(key)
+            self.hits += 1
+            return self.store[key]
+        self.misses += 1
+        return None
+
+    def put(self, key, value):
+        self.store[key] = value
+        self.store.move_to_end(key)
+        if len(self.store) > self.maxsize:
+            self.store.popitem(last=False)
+
+    def clear(self):
+        self.store.clear()
+        self.hits = self.misses = 0
+
+    def info(self):
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self.store), 'maxsize': self.maxsize}
+
+
+class _PartialsRecorder(object):
+    '''Passes the partials through to the jacobian and keeps the values that were set, so they can be replayed on a hit'''
+
+    def __init__(self, partials):
+        self.partials = partials
+        self.values = {}
+
+    def __getitem__(self, key):
+        return self.partials[key]
+
+    def __setitem__(self, key, value):
+        self.partials[key] = value
+        self.values[key] = np.array(self.partials[key], copy=True)
+
+
+class MemoizedComponent(object):
+    '''Mixin for an ExplicitComponent that stores its outputs and partials per input point in an EvaluationCache,
+    so an evaluation at a point that was already computed is not done again.
+    Put it before the component class: class CachedComp(MemoizedComponent, Comp)'''
+
+    def initialize(self):
+        super().initialize()
+        self.options.declare('cache_size', default=128, types=int, desc='Maximum amount of cached evaluations')
+        self.options.declare('cache_digits', default=12, types=int, desc='Significant digits of the inputs in the cache key')
+
+    def _caches(self):
+        if not hasattr(self, 'compute_cache'):
+            self.compute_cache = EvaluationCache(self.options['cache_size'], self.options['cache_digits'])
+            self.partials_cache = EvaluationCache(self.options['cache_size'], self.options['cache_digits'])
+        return self.compute_cache, self.partials_cache
+
+    def compute(self, inputs, outputs):
+        cache = self._caches()[0]
+        key = cache.key(inputs.asarray())
+        values = cache.get(key)
+        if values is None:
+            super().compute(inputs, outputs)
+            cache.put(key, outputs.asarray().copy())
+        else:
+            outputs.set_val(values)
+
+    def compute_partials(self, inputs, partials):
+        cache = self._caches()[1]
+        key = cache.key(inputs.asarray())
+        values = cache.get(key)
+        if values is None:
+            recorder = _PartialsRecorder(partials)
+            super().compute_partials(inputs, recorder)
+            cache.put(key, recorder.values)
+        else:
+            for name, value in values.items():
+                partials[name] = value
+
+    def cache_info(self):
+        compute_cache, partials_cache = self._caches()
+        return {'compute': compute_cache.info(), 'partials': partials_cache.info()}
+
+    def cache_clear(self):
+        for cache in self._caches():
+            cache.clear()
@@ -0,0 +1,139 @@
+from OHBModel import OHBModel_batch, launcher_curve
+from scipy.stats import norm
+import numpy as np
+
+
+class StreamingStats(object):
+    '''Running statistics of a stream of values, updated one chunk at a time with bounded memory.
+    The mean and standard deviation are exact, percentiles are read from a fixed histogram whose range
+    is set from the first chunk (widened by margin times its spread on both sides).
+
+    bins    = Amount of histogram bins
+    margin  = Widening of the histogram range of the first chunk, relative to its spread
+    '''
+
+    def __init__(self, bins=2000, margin=0.5):
+        self.bins, self.margin = bins, margin
+        self.n      = 0
+        self.mean   = 0.
+        self.M2     = 0.                    #Sum of squared deviations from the mean
+        self.min    = np.inf
+        self.max    = -np.inf
+        self.edges  = None
+        self.counts = None
+        self.under  = 0                     #Values below and above the histogram range
+        self.over   = 0
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float).ravel()
+        if len(values) == 0:
+            return
+        if self.edges is None:
+            spread = values.max()-values.min()
+            spread = spread if spread > 0 else max(abs(values[0]), 1.)
+            self.edges  = np.linspace(values.min()-self.margin*spread, values.max()+self.margin*spread, self.bins+1)
+            self.counts = np.zeros(self.bins, dtype=np.int64)
+        #Combination of the running and chunk mean and variance (Chan et al.)
+        n, mean, M2 = len(values), values.mean(), ((values-values.mean())**2).sum()
+        delta       = mean-self.mean
+        total       = self.n+n
+        self.mean   += delta*n/total
+        self.M2     += M2+delta**2*self.n*n/total
+        self.n      = total
+        self.min    = min(self.min, values.min())
+        self.max    = max(self.max, values.max())
+        self.counts += np.histogram(values, self.edges)[0]
+        self.under  += int((values < self.edges[0]).sum())
+        self.over   += int((values > self.edges[-1]).sum())
+
+    @property
+    def std(self):
+        return (self.M2/(self.n-1))**0.5 if self.n > 1 else 0.
+
+    def percentile(self, q):
+        '''Percentile(s) q in [%], linearly interpolated within the histogram bins (nan if it falls outside the histogram)'''
+        cumulative = self.under+np.concatenate([[0], np.cumsum(self.counts)])
+        target = np.asarray(q, dtype=float)/100.*self.n
+        inside = (target >= self.under) & (target <= cumulative[-1])
+        return np.where(inside, np.interp(target, cumulative, self.edges), np.nan)
+
+    def summary(self, percentiles=(5, 50, 95)):
+        return {'n': self.n, 'mean': float(self.mean), 'std': float(self.std), 'min': float(self.min), 'max': float(self.max),
+                **{f'p{q}': float(value) for q, value in zip(percentiles, self.percentile(percentiles))}}
+
+
+def latin_hypercube(n, d, rng):
+    '''n stratified samples in the d dimensional unit cube, every dimension has one sample in each of its n strata'''
+    u = (np.arange(n)[:, None]+rng.random((n, d)))/n
+    for k in range(d):
+        u[:, k] = u[rng.permutation(n), k]
+    return u
+
+
+def coefficient_sampler(popt, pcov):
+    '''Returns a function that turns standard normal samples (n, len(popt)) into samples of the fit coefficients.
+    The covariance of the polynomial fits is badly conditioned, so it is factorized as a correlation matrix
+    with an eigen decomposition in which slightly negative eigenvalues are set to zero.'''
+    popt, pcov = np.asarray(popt), np.asarray(pcov)
+    if not np.all(np.isfinite(pcov)):
+        raise ValueError("The launcher fit has no covariance (as many coefficients as data points), sample without launcher uncertainty")
+    scale   = np.sqrt(np.diag(pcov))
+    w, v    = np.linalg.eigh(pcov/np.outer(scale, scale))
+    factor  = scale[:, None]*v*np.sqrt(np.clip(w, 0., None))
+    return lambda z: popt+z@factor.T
+
+
+def propagate(I_sp, P_sat, t_trans, M_dry, R_f, eta='30', launcher='Soyuz', P_sigma=0.05, eta_sigma=0.05, launcher_uncertainty=True,
+              n=100000, chunksize=10000, method='lhs', seed=0, bins=2000, percentiles=(5, 50, 95)):
+    '''Monte Carlo propagation of the uncertainty in Power, Thrust Efficiency and launcher performance through OHBModel.
+    Samples are drawn and evaluated with OHBModel_batch chunk by chunk, so memory does not grow with n,
+    and the statistics of (R_inj, M_sep, T_eff) are accumulated in StreamingStats.
+
+    I_sp, P_sat, t_trans, M_dry, R_f, eta, launcher = Nominal values and options (see OHBModel)
+    P_sigma   = Relative standard deviation of the Satellite Power (normal distribution)
+    eta_sigma = Relative standard deviation of the Thrust Efficiency (normal distribution).
+                The thrust at a given Isp and power is proportional to the thrust efficiency, so it scales the Force-Power ratio.
+    launcher_uncertainty = if True the launcher curve coefficients are sampled from the covariance of the curve fit
+    n         = Amount of samples
+    chunksize = Amount of samples evaluated at once
+    method    = 'lhs' for Latin hypercube sampling (each chunk is a Latin hypercube) or 'mc' for plain random sampling
+    seed      = Seed of the random generator
+    bins      = Amount of histogram bins of the statistics
+    percentiles = Percentiles in [%] given in the summary
+
+    returns a dictionary with the summary and the StreamingStats of 'R_inj', 'M_sep' and 'T_eff'
+    '''
+    if method not in ['lhs', 'mc']:
+        raise ValueError("Invalid method. Expected one of: ['lhs', 'mc']")
+    rng = np.random.default_rng(seed)
+    RtoM, popt, pcov = launcher_curve(launcher, givepcov=True)
+    sampler = coefficient_sampler(popt, pcov) if launcher_uncertainty == True else None
+    d = 2+(len(popt) if sampler is not None else 0)
+
+    stats = {name: StreamingStats(bins) for name in ['R_inj', 'M_sep', 'T_eff']}
+    for start in range(0, n, chunksize):
+        m = min(chunksize, n-start)
+        u = latin_hypercube(m, d, rng) if method == 'lhs' else rng.random((m, d))
+        z = norm.ppf(u)
+        #Thrust is Force-Power ratio times power, so both relative errors act on the effective power
+        power = P_sat*np.clip(1+P_sigma*z[:, 0], 0.01, None)*np.clip(1+eta_sigma*z[:, 1], 0.01, None)
+        #Separation mass of 1 kg gives the Transfer Efficiency per kg of separation mass
+        R_inj, unit, T_unit = OHBModel_batch(I_sp, power, t_trans, M_dry, R_f, eta=eta, M_sep_v=1.)
+        if sampler is not None:
+            coefficients = sampler(z[:, 2:])
+            M_sep = np.polynomial.polynomial.polyval(R_inj, coefficients.T, tensor=False)
+        else:
+            M_sep = RtoM(R_inj)
+        for name, values in zip(['R_inj', 'M_sep', 'T_eff'], [R_inj, M_sep, M_sep*T_unit]):
+            stats[name].update(values)
+
+    return {name: {'summary': stat.summary(percentiles), 'stats': stat} for name, stat in stats.items()}
+
+
+if __name__ == '__main__':
+    import time
+    start_time = time.time()
+    result = propagate(2000., 2500., 90*24*3600., 1000., 23222.*10**3, launcher='Soyuz', n=200000)
+    for name, value in result.items():
+        print(name, value['summary'])
+    print(f"executed in {(time.time()-start_time)} seconds")
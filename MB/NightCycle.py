@@ -1,9 +1,9 @@
 from openmdao.api import ExplicitComponent
 from math import sqrt, asin, pi, cos, radians
 from numpy import exp
-from fasterimplicitradius import GetRadius
+from fasterimplicitradius import GetRadiusTable
 from GetMaxDark import GetDarkTime
-import json
+from SatCatalog import GetSatellite, Satellite
 
 
 class MBOne(ExplicitComponent):
@@ -27,10 +27,21 @@ class MBOne(ExplicitComponent):
         self.options.declare('theta', default=45.)
         self.options.declare('M_st', default=45.)
         self.options.declare('Sat', default='arrowRIT', values=['arrowRIT','arrowHET','HAG1','EDRS-C','H2Sat1','Electra'])
-        self.options.declare('SatClass')
+        self.options.declare('SatClass', default=None)
+        self.options.declare('Satellite', default=None, types=Satellite, allow_none=True, desc='Satellite from SatCatalog, used instead of Sat')
         self.options.declare('M_batt,min', default=1.)
 
     def setup(self):
+        #Satellite values from the catalog, the options are used for satellites that are not in the catalog
+        self.sat = self.options['Satellite']
+        if self.sat is None:
+            self.sat = GetSatellite(self.options['Sat'])
+        if self.sat is None:
+            self.sat = Satellite(SatelliteName=self.options['Sat'], M_0=self.options['M_0'], T_0=self.options['T_0'],
+                                 I_sp=self.options['I_sp'], P_th=self.options['P_th'], M_u=self.options['M_u'],
+                                 M_ps=self.options['M_ps'], M_st=self.options['M_st'], P_req=self.options['P_req'],
+                                 SatClass=self.options['SatClass'])
+
         self.add_input('M_batt', desc='Battery Mass in [kg]')
         self.add_input('M_sa', desc='Solar Array Mass in [kg]')
 
@@ -39,35 +50,14 @@ class MBOne(ExplicitComponent):
         self.add_output('M_batt,min', desc='Minimal Battery Mass')
         self.add_output('M_p', desc='Propellant Mass')
 
-    def compute(self, inputs, outputs):
+    def set_satellite(self, sat):
+        '''Switches to another Satellite (from SatCatalog) without setting up the Problem again'''
+        if sat.P_th is None:
+            raise ValueError(f"Thrust Power needs to be known for {sat.SatelliteName}")
+        self.sat = sat
 
-        Satdat = json.load(open("SatData.json"))
-
-        for i in Satdat['Satellites']:
-            if i['SatelliteName'] == self.options['Sat']:
-                self.options['M_0']     = i['Wet Mass']
-                self.options['T_0']     = i['Thrust']
-                self.options['I_sp']    = i['Specific Impulse']
-                self.options['P_th']    = i['Thrust Power']
-                self.options['M_u']     = i['Payload Mass']
-                self.options['M_ps']    = i['Propulsion System Mass']
-                self.options['M_st']    = i['Structural Mass']
-                self.options['P_req']   = i['Station Keeping Power']
-
-                self.options['SatClass'] = i['Classification']
-
-        #Checks for any unkowns
-        if self.options['SatClass'] == "GEO":
-            if self.options['M_u'] == "Unknown":
-                self.options['M_u'] = 0.32*self.options['M_0']
-            if self.options['M_st'] == "Unknown":
-                self.options['M_st'] = 0.3*self.options['M_0']
-            if self.options['M_ps'] == "Unknown":
-                self.options['M_ps'] = 0.07*self.options['M_0']
-            if self.options['P_req'] == "Unknown":
-                self.options['P_req'] = 691.
-            if self.options['P_th'] == "Unknown":
-                print("Thrust Power needs to be known")
+    def compute(self, inputs, outputs):
+        sat     = self.sat
 
         g0      = 9.80665
         G_sc    = self.options['G_sc']      #Solar constant in [W/m2]
@@ -76,28 +66,28 @@ class MBOne(ExplicitComponent):
         E_sp    = self.options['E_sp']      #Specific Energy of battery in [J/kg]
         theta   = self.options['theta']     #Worst Case Average Sun-Angle solar area in [degrees]
 
-        A_sa    = inputs['M_sa']/Z_sa       #Solar Array area in [m2]
-        C_batt  = inputs['M_batt']*E_sp     #Battery Capacity in [J]
+        A_sa    = inputs['M_sa'][0]/Z_sa    #Solar Array area in [m2]
+        C_batt  = inputs['M_batt'][0]*E_sp  #Battery Capacity in [J]
         P_sa    = A_sa*G_sc*eta_sa*cos(radians(theta))  #Solar Array Power in [W]
 
-        M_0 = self.options['M_0']           #Initial Wet Mass of Satellite in [kg]
+        M_0 = sat.M_0                       #Initial Wet Mass of Satellite in [kg]
         R_0 = self.options['R_0']           #Initial Orbit Radius in [m]
         R_f = self.options['R_f']           #Final Orbit Radius in [m]
         mu  = self.options['mu']            #Earth's gravitational constant in [m3/s2]
-        I_sp = self.options['I_sp']           #Exhaust Velocity of Thruster in [m/s]
+        I_sp = sat.I_sp                     #Exhaust Velocity of Thruster in [m/s]
 
 
-        DV_tot  = sqrt(mu/R_0)*(sqrt(2*R_f/(R_f+R_0))-1)+sqrt(muLauncher Choice/R_f)*(1-sqrt(2*R_0/(R_f+R_0))) #Total DeltaV required in [m/s]
+        DV_tot  = sqrt(mu/R_0)*(sqrt(2*R_f/(R_f+R_0))-1)+sqrt(mu/R_f)*(1-sqrt(2*R_0/(R_f+R_0))) #Total DeltaV required in [m/s]
         M_p     = M_0*(1-exp(-DV_tot/(I_sp*g0)))  #Propellant Mass required in [kg]
 
 
-        M_st    = self.options['M_st']      #Satellite Structural Mass in [kg]
-        M_u     = self.options['M_u']       #Payload Mass in [kg]
-        M_ps    = self.options['M_ps']      #Propulsion System Mass in [kg]
-        P_req   = self.options['P_req']     #Required Household Power in [W]
+        M_st    = sat.M_st                  #Satellite Structural Mass in [kg]
+        M_u     = sat.M_u                   #Payload Mass in [kg]
+        M_ps    = sat.M_ps                  #Propulsion System Mass in [kg]
+        P_req   = sat.P_req                 #Required Household Power in [W]
         eta_dis = self.options['eta_dis']   #Discharge efficiency in [-]
-        P_th    = self.options['P_th']      #Thrust Phase Power required in [W]
-        T_0     = self.options['T_0']       #Thrust of propulsion system in [N]
+        P_th    = sat.P_th                  #Thrust Phase Power required in [W]
+        T_0     = sat.T_0                   #Thrust of propulsion system in [N]
 
 
 
@@ -121,7 +111,7 @@ class MBOne(ExplicitComponent):
         while Ri<R_f:
             DVi     = (T_0/Mi)*t_dc         #Increasein DeltaV
             Rimin1  = Ri
-            Ri      = GetRadius(DV=DVi,Ri = Ri,mu=mu)
+            Ri      = GetRadiusTable(DV=DVi,Ri = Ri,mu=mu)
             eta_dark  = asin(R_E/Ri)/pi     #Darkness percentage of total current orbit
             P_sadark = (1-eta_dark)*P_sa
             if P_sadark>P_req:
@@ -137,7 +127,6 @@ class MBOne(ExplicitComponent):
         #linear overshoot correction
         t -= (t_c+t_dc)*(Ri-R_f)/(Ri-Rimin1)
         #Outputs
-        print(M_st)
         outputs['M_d']  = M_0-(M_u+M_ps+M_p+M_st)
         outputs['t_tot']= t
         outputs['M_p'] = M_p
@@ -1,9 +1,35 @@
 from math import exp,log,sqrt
-from interpolate import csv_ip1d
-from curvefitter import csvtocurve
+import numpy as np
+from dataregistry import registry_ip1d, registry_curve
 from csv import writer
 
 
+def launcher_curve(launcher,givepcov=False):
+    '''Returns the curve fitted function that converts Injection Height [km] to Separation Mass [kg] for the given launcher.
+    The fit coefficients are read from the coefficient store and reused until the launcher data file changes.
+    If givepcov is True the optimal parameters and their covariance matrix are returned as well'''
+    if launcher == 'Ariane62':
+        #Third order polynomial approximation of Ariane62 Launcher Data (MEO)
+        f = lambda x,a,b,c,d : a+b*x+c*x**2+d*x**3
+        path = 'Data/Launchers/Ariane62MassRadiusWollenhaupt.csv'
+        form = 'poly3'
+    elif launcher == 'Soyuz':
+        #Fourth Order polynomial approximation of Soyuz Launcher Data (MEO)
+        f = lambda x,a,b,c,d,e : a+b*x+c*x**2+d*x**3+e*x**4
+        path = 'Data/Launchers/Soyuz.csv'
+        form = 'poly4'
+    elif launcher == 'Ariane64':
+        #Fourth Order polynomial approximation of Soyuz Launcher Data (MTO)
+        f = lambda x,a,b,c,d,e : a+b*x+c*x**2+d*x**3+e*x**4
+        path = 'Data/Launchers/Ariane64.csv'
+        form = 'poly4'
+
+    RtoM, popt, pcov = registry_curve(f,path,form,givepcov=True)
+    if givepcov == True:
+        return RtoM, popt, pcov
+    return RtoM
+
+
 def OHBModel(I_sp, P_sat, t_trans, M_dry, R_f, eta='30',launcher=None, R_inj_v=None,M_sep_v=None,print_v=False):
     '''Determines the Injection Height [km], Separation Mass [kg] and Transfer Efficiency [%] given the following parameters
     I_sp    = Specific Impulse in [s]
@@ -13,8 +39,8 @@ def OHBModel(I_sp, P_sat, t_trans, M_dry, R_f, eta='30',launcher=None, R_inj_v=N
     R_f     = Target Orbit in [m]
     eta     = Thrust Efficiency in [%] (Limited Options) or 'Average'
     launcher= Launchername from which data will be used to convert Injection Height to Separation Mass (Limited Options or add your own)
-    R_inj_v = Optional Inject Orbit Height Value in [m], if not given calculated from maximum possible orbit transfer
-    M_inj_v = Optional Separation Mass in [kg], if not given: calculated from launcher data
+    R_inj_v = Optional Inject Orbit Height Value in [km], if not given calculated from maximum possible orbit transfer
+    M_sep_v = Optional Separation Mass in [kg], if not given: calculated from launcher data
 
     outputs:
     R_inj = Injection Height in [km]
@@ -37,7 +63,7 @@ def OHBModel(I_sp, P_sat, t_trans, M_dry, R_f, eta='30',launcher=None, R_inj_v=N
     #Creating Interpolating Function from Figure 2 in Wollenhaupt paper:
     #"Future Electric Propulsion Needs deduced from launcher and mission constraints"
     #Selects right data set based on 'eta'. 'eta' options only make sense if you see the figure.
-    FPfunc, bounds  = csv_ip1d('Data/FP_Isp'+eta+'.csv', bounds=True)
+    FPfunc, bounds  = registry_ip1d('Data/FP_Isp'+eta+'.csv')
 
     #Specific Impulse must be between the bounds of the input data above
     if not (bounds[0]<=I_sp<=bounds[1]):
@@ -64,19 +90,9 @@ def OHBModel(I_sp, P_sat, t_trans, M_dry, R_f, eta='30',launcher=None, R_inj_v=N
             R_inj = 400
 
 
-    if launcher == 'Ariane62':
-        #Third order polynomial approximation of Ariane62 Launcher Data (MEO)
-        f = lambda x,a,b,c,d : a+b*x+c*x**2+d*x**3
-        RtoM = csvtocurve(f,'Data/Launchers/Ariane62MassRadiusWollenhaupt.csv')
-    elif launcher == 'Soyuz':
-        #Fourth Order polynomial approximation of Soyuz Launcher Data (MEO)
-        f = lambda x,a,b,c,d,e : a+b*x+c*x**2+d*x**3+e*x**4
-        RtoM = csvtocurve(f,'Data/Launchers/Soyuz.csv')
-    elif launcher == 'Ariane64':
-        #Fourth Order polynomial approximation of Soyuz Launcher Data (MTO)
-        f = lambda x,a,b,c,d,e : a+b*x+c*x**2+d*x**3+e*x**4
-        RtoM = csvtocurve(f,'Data/Launchers/Ariane64.csv')
-    elif launcher == None and M_sep_v == None:
+    if launcher != None:
+        RtoM = launcher_curve(launcher)
+    elif M_sep_v == None:
         raise RuntimeError('Neither launcher nor M_sep_v are specified. Cannot Calculate T_eff')
 
 
@@ -96,6 +112,73 @@ def OHBModel(I_sp, P_sat, t_trans, M_dry, R_f, eta='30',launcher=None, R_inj_v=N
 
     return R_inj, Msep, Teff
 
+def OHBModel_batch(I_sp, P_sat, t_trans, M_dry, R_f, eta='30',launcher=None, R_inj_v=None,M_sep_v=None):
+    '''Vectorized version of OHBModel. All numerical inputs can be given as scalars or NumPy arrays,
+    which are broadcast against each other so a whole design space is evaluated in one call.
+    eta and launcher are the same (single) options as in OHBModel.
+    I_sp    = Specific Impulse in [s]
+    P_sat   = Satellite Power in [W]
+    t_trans = Allowed Transfer Time in [s]
+    M_dry   = Dry Satellite Mass in [kg]
+    R_f     = Target Orbit in [m]
+    R_inj_v = Optional array of Inject Orbit Heights in [km]
+    M_sep_v = Optional array of Separation Masses in [kg]
+
+    outputs (arrays with the broadcast shape of the inputs):
+    R_inj = Injection Height in [km]
+    M_sep = Separation Mass in [kg]
+    T_eff = Transfer Efficiency in [%]
+    '''
+
+    #Setting Errors and Parameter Options
+    eta_options = ['30','50','70','100','Average']
+    if eta not in eta_options:
+        raise ValueError(f"Invalid eta. Expected one of: {eta_options}")
+
+    launcher_options = ['Ariane62', 'Soyuz', 'Ariane64',None]
+    if launcher not in launcher_options:
+        raise ValueError(f"Invalid launcher. Expected one of: {launcher_options}")
+
+    if launcher == None and M_sep_v is None:
+        raise RuntimeError('Neither launcher nor M_sep_v are specified. Cannot Calculate T_eff')
+    if launcher != None and M_sep_v is not None:
+        raise RuntimeError('You have specified both a separation mass value [M_sep_v] and a [launcher] to derive the Separation Mass [Msep] from, pick one')
+
+    I_sp, P_sat, t_trans, M_dry, R_f = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (I_sp, P_sat, t_trans, M_dry, R_f)))
+
+    if not np.all((6371000<=R_f) & (R_f<=36000000)):
+        raise ValueError(f"Invalid Target Orbit. Must be between:6371000 and 36000000 [m]!!" )
+
+    FPfunc, bounds  = registry_ip1d('Data/FP_Isp'+eta+'.csv')
+
+    if not np.all((bounds[0]<=I_sp) & (I_sp<=bounds[1])):
+        raise ValueError(f"For eta={eta}. I_sp must be between {bounds[0]:.1f} and {bounds[1]:.1f} seconds")
+
+    FP_ratio= FPfunc(I_sp)*10**-6                   #Force-Power Ratio in [N/W]
+    Thrust  = FP_ratio*P_sat                        #Thrust in [N]
+    mflow   = Thrust/(I_sp*9.81)                    #Mass Flow in [kg/s]
+    Mp      = mflow*t_trans                         #Propellant Mass in [kg]
+
+    if R_inj_v is not None:
+        R_inj = np.broadcast_to(np.asarray(R_inj_v, dtype=float), Mp.shape)
+    else:
+        DV      = I_sp*9.81*np.log1p(Mp/M_dry)          #DeltaV in [m/s] (Tsiolkovsky Equation)
+        mu      = 3.98600*10**14                        #Earth's Gravitational Parameter in [m3/s2]
+        R0      = mu/((DV+np.sqrt(mu/R_f))**2)          #Injection Radius in [m]
+        R_E     = 6371.                                 #Earth Radius in [km]
+        #Injection Height in [km] with minimal Orbit height of 400 km
+        R_inj   = np.maximum(R0/1000.-R_E, 400.)
+
+    if M_sep_v is not None:
+        Msep    = np.broadcast_to(np.asarray(M_sep_v, dtype=float), Mp.shape)
+    else:
+        Msep    = launcher_curve(launcher)(R_inj)   #Separation Mass in [kg]
+    Teff    = Msep/(M_dry+Mp)*100                   #Transfer Efficiency in [%]
+
+    R_inj, Msep, Teff = np.broadcast_arrays(R_inj, Msep, Teff)
+    return R_inj, Msep, Teff
+
+
 if __name__ == '__main__':
     from CreateErrorPlots import fig3errorplot, fig4errorplot
     from FiguresDataCreate import create_fig3data, create_fig4data
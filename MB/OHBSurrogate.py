@@ -0,0 +1,139 @@
+from OHBModel import OHBModel, OHBModel_batch, launcher_curve
+from dataregistry import registry_ip1d, registry_file
+from bisect import bisect
+from math import log, exp
+import numpy as np
+
+#Default trained domain of P_sat in [W], t_trans in [s] and M_dry in [kg]
+P_BOX = (500., 20000.)
+T_BOX = (30*24*3600., 720*24*3600.)
+M_BOX = (100., 5000.)
+
+
+class OHBSurrogate(object):
+    '''Table approximation of OHBModel for one eta, launcher and target orbit.
+    In OHBModel the Power and Transfer Time only appear as the Energy P_sat*t_trans, and the propellant mass scales with M_dry,
+    so the Injection Radius only depends on I_sp and q = P_sat*t_trans/M_dry. Its logarithm is tabulated on an (I_sp, log q) grid
+    and interpolated bilinearly, the 400 km minimum height and the launcher curve are applied to the interpolated radius.
+    The I_sp axis contains the data points of the (linearly interpolated) Force-Power data, so the Force-Power ratio,
+    and with it the propellant mass, is interpolated exactly.
+
+    eta, launcher, R_f  = see OHBModel
+    P_box, t_box, M_box = (min, max) of P_sat in [W], t_trans in [s] and M_dry in [kg] of the trained domain
+    n_isp, n_q          = Amount of (geometrically spaced) grid points in I_sp and q
+    n_validate          = Amount of random points in the domain used to measure the error
+
+    max_error = Maximum relative error of (R_inj, M_sep, T_eff) at the validation points
+    '''
+
+    def __init__(self, eta='30', launcher='Soyuz', R_f=23222.*10**3, P_box=P_BOX, t_box=T_BOX, M_box=M_BOX, n_isp=400, n_q=400, n_validate=20000):
+        self.eta, self.launcher, self.R_f = eta, launcher, R_f
+        self.P_box, self.t_box, self.M_box = P_box, t_box, M_box
+        FPfunc, self.Isp_box = registry_ip1d('Data/FP_Isp'+eta+'.csv')
+        self.q_box = (P_box[0]*t_box[0]/M_box[1], P_box[1]*t_box[1]/M_box[0])
+        self.RtoM = launcher_curve(launcher)
+
+        #Grid of the Injection Radius in [m], same equations as OHBModel with M_dry = 1 and t_trans = 1 so P_sat equals q
+        self.Isps   = np.union1d(np.geomspace(self.Isp_box[0], self.Isp_box[1], n_isp), FPfunc.x)
+        self.logqs  = np.linspace(log(self.q_box[0]), log(self.q_box[1]), n_q)
+        self.ratios = FPfunc(self.Isps)*10**-6/(self.Isps*9.81)     #Propellant Mass per unit q
+        mu          = 3.98600*10**14
+        DV          = self.Isps[:, None]*9.81*np.log1p(self.ratios[:, None]*np.exp(self.logqs)[None, :])
+        self.logR0  = np.log(mu/((DV+np.sqrt(mu/R_f))**2))
+
+        #Lists for the scalar path, which avoids the numpy overhead
+        self._Isps, self._logqs, self._ratios = self.Isps.tolist(), self.logqs.tolist(), self.ratios.tolist()
+        self._logR0 = self.logR0.tolist()
+        self._coefficients = launcher_curve(launcher, givepcov=True)[1][::-1].tolist()   #Highest order first
+
+        self.max_error = self.validate(n_validate)
+
+    def validate(self, n, seed=0):
+        '''Maximum relative error of (R_inj, M_sep, T_eff) at n random points in the trained domain'''
+        rng     = np.random.default_rng(seed)
+        I_sp    = rng.uniform(*self.Isp_box, n)
+        P_sat   = rng.uniform(*self.P_box, n)
+        t_trans = rng.uniform(*self.t_box, n)
+        M_dry   = rng.uniform(*self.M_box, n)
+        exact   = OHBModel_batch(I_sp, P_sat, t_trans, M_dry, self.R_f, eta=self.eta, launcher=self.launcher)
+        approx  = self.evaluate_batch(I_sp, P_sat, t_trans, M_dry)
+        return tuple(float(np.max(np.abs(a/e-1))) for a, e in zip(approx, exact))
+
+    def indomain(self, I_sp, P_sat, t_trans, M_dry):
+        return (self.Isp_box[0] <= I_sp <= self.Isp_box[1] and self.P_box[0] <= P_sat <= self.P_box[1]
+                and self.t_box[0] <= t_trans <= self.t_box[1] and self.M_box[0] <= M_dry <= self.M_box[1])
+
+    def evaluate(self, I_sp, P_sat, t_trans, M_dry):
+        '''Surrogate (R_inj, M_sep, T_eff) for a single point inside the trained domain'''
+        Isps, logqs, t = self._Isps, self._logqs, self._logR0
+        q       = P_sat*t_trans/M_dry
+        logq    = log(q)
+        i       = min(max(bisect(Isps, I_sp), 1), len(Isps)-1)
+        j       = min(max(bisect(logqs, logq), 1), len(logqs)-1)
+        u       = (I_sp-Isps[i-1])/(Isps[i]-Isps[i-1])
+        v       = (logq-logqs[j-1])/(logqs[j]-logqs[j-1])
+        logR0   = (1-u)*((1-v)*t[i-1][j-1]+v*t[i-1][j])+u*((1-v)*t[i][j-1]+v*t[i][j])
+        #The Force-Power ratio is linear in between grid points, so the propellant mass is exact
+        FP      = ((1-u)*self._ratios[i-1]*Isps[i-1]+u*self._ratios[i]*Isps[i])/I_sp
+        R_inj   = max(exp(logR0)/1000.-6371., 400.)
+        Msep    = 0.
+        for coefficient in self._coefficients:
+            Msep = Msep*R_inj+coefficient
+        return R_inj, Msep, Msep/(M_dry*(1+FP*q))*100
+
+    def evaluate_batch(self, I_sp, P_sat, t_trans, M_dry):
+        '''Surrogate (R_inj, M_sep, T_eff) for arrays of points inside the trained domain'''
+        I_sp, P_sat, t_trans, M_dry = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (I_sp, P_sat, t_trans, M_dry)))
+        Isps, logqs, t = self.Isps, self.logqs, self.logR0
+        q       = P_sat*t_trans/M_dry
+        logq    = np.log(q)
+        i       = np.clip(np.searchsorted(Isps, I_sp, side='right'), 1, len(Isps)-1)
+        j       = np.clip(np.searchsorted(logqs, logq, side='right'), 1, len(logqs)-1)
+        u       = (I_sp-Isps[i-1])/(Isps[i]-Isps[i-1])
+        v       = (logq-logqs[j-1])/(logqs[j]-logqs[j-1])
+        logR0   = (1-u)*((1-v)*t[i-1, j-1]+v*t[i-1, j])+u*((1-v)*t[i, j-1]+v*t[i, j])
+        FP      = ((1-u)*self.ratios[i-1]*Isps[i-1]+u*self.ratios[i]*Isps[i])/I_sp
+        R_inj   = np.maximum(np.exp(logR0)/1000.-6371., 400.)
+        Msep    = self.RtoM(R_inj)
+        return R_inj, Msep, Msep/(M_dry*(1+FP*q))*100
+
+
+def get_surrogate(eta='30', launcher='Soyuz', R_f=23222.*10**3, P_box=P_BOX, t_box=T_BOX, M_box=M_BOX):
+    '''Returns the trained OHBSurrogate for the given options, trained once and again only when the Force-Power data changes'''
+    kind = ('ohbsurrogate', launcher, R_f, P_box, t_box, M_box)
+    return registry_file(kind, 'Data/FP_Isp'+eta+'.csv', lambda: OHBSurrogate(eta, launcher, R_f, P_box, t_box, M_box))
+
+
+def OHBModel_surrogate(I_sp, P_sat, t_trans, M_dry, R_f, eta='30', launcher='Soyuz'):
+    '''Fast version of OHBModel (with a launcher) using a trained OHBSurrogate, see get_surrogate for its error.
+    Points outside the trained domain are calculated with the exact OHBModel.
+    Inputs and outputs are the same as OHBModel. Inside an optimizer loop get_surrogate(...).evaluate skips the lookup of the surrogate.'''
+    surrogate = get_surrogate(eta, launcher, R_f)
+    if surrogate.indomain(I_sp, P_sat, t_trans, M_dry):
+        return surrogate.evaluate(I_sp, P_sat, t_trans, M_dry)
+    return OHBModel(I_sp, P_sat, t_trans, M_dry, R_f, eta=eta, launcher=launcher)
+
+
+def OHBModel_surrogate_batch(I_sp, P_sat, t_trans, M_dry, R_f, eta='30', launcher='Soyuz'):
+    '''Fast version of OHBModel_batch (with a launcher) using a trained OHBSurrogate.
+    Points outside the trained domain are calculated with the exact OHBModel_batch.'''
+    surrogate = get_surrogate(eta, launcher, R_f)
+    I_sp, P_sat, t_trans, M_dry = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (I_sp, P_sat, t_trans, M_dry)))
+    inside  = ((surrogate.Isp_box[0] <= I_sp) & (I_sp <= surrogate.Isp_box[1]) & (surrogate.P_box[0] <= P_sat) & (P_sat <= surrogate.P_box[1])
+               & (surrogate.t_box[0] <= t_trans) & (t_trans <= surrogate.t_box[1]) & (surrogate.M_box[0] <= M_dry) & (M_dry <= surrogate.M_box[1]))
+    outputs = [np.empty(I_sp.shape) for i in range(3)]
+    for output, value in zip(outputs, surrogate.evaluate_batch(I_sp[inside], P_sat[inside], t_trans[inside], M_dry[inside])):
+        output[inside] = value
+    if not np.all(inside):
+        outside = ~inside
+        for output, value in zip(outputs, OHBModel_batch(I_sp[outside], P_sat[outside], t_trans[outside], M_dry[outside], R_f, eta=eta, launcher=launcher)):
+            output[outside] = value
+    return tuple(outputs)
+
+
+if __name__ == '__main__':
+    import time
+    start_time = time.time()
+    surrogate = get_surrogate('30', 'Soyuz')
+    print(f"trained in {(time.time()-start_time)} seconds, maximum relative errors (R_inj, M_sep, T_eff): {surrogate.max_error}")
+    print(OHBModel_surrogate(2000., 2500., 90*24*3600., 1000., 23222.*10**3), OHBModel(2000., 2500., 90*24*3600., 1000., 23222.*10**3, launcher='Soyuz'))
@@ -0,0 +1,85 @@
+from OHBModel import OHBModel_batch
+from dataregistry import registry_ip1d
+import numpy as np
+
+#Inverse golden ratio, interval reduction per golden section step
+R_GOLD = (5**0.5-1)/2
+
+
+def optimal_isp(P_sat, t_trans, M_dry, R_f, eta='30', launcher='Soyuz', n_bracket=17, n_candidates=4, tol=0.1, maxiter=60):
+    '''Finds the Specific Impulse that maximizes the Transfer Efficiency of OHBModel, for one or many missions at once.
+    The allowed Isp range is first sampled on a coarse grid to bracket the best Isp of each mission,
+    the brackets are then narrowed down with a golden section search. All missions are evaluated together in every step.
+    The Force-Power data is interpolated linearly, so its data points are added to the grid: in between them
+    the Transfer Efficiency is smooth, at the data points it can have kinks and local maxima.
+    Because of these local maxima the brackets around the n_candidates best grid points are all searched.
+
+    P_sat   = Satellite Power in [W]
+    t_trans = Allowed Transfer Time in [s]
+    M_dry   = Dry Satellite Mass in [kg]
+    R_f     = Target Orbit in [m]
+    (P_sat, t_trans, M_dry and R_f can be scalars or arrays, which are broadcast against each other, one mission per element)
+    eta     = Thrust Efficiency option (see OHBModel)
+    launcher= Launchername (see OHBModel)
+    n_bracket = Amount of evenly spaced Isp grid points used for the bracketing (on top of the Force-Power data points)
+    n_candidates = Amount of brackets searched per mission
+    tol     = Width of the final Isp interval in [s]
+    maxiter = Maximum amount of golden section steps
+
+    outputs (arrays with the broadcast shape of the inputs):
+    I_sp  = Optimal Specific Impulse in [s]
+    T_eff = Transfer Efficiency at the optimal Specific Impulse in [%]
+    '''
+    P_sat, t_trans, M_dry, R_f = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (P_sat, t_trans, M_dry, R_f)))
+    shape = P_sat.shape
+    params = [x.ravel() for x in (P_sat, t_trans, M_dry, R_f)]
+    m = len(params[0])
+
+    def Teff(I_sp, params):
+        #Transfer Efficiency, I_sp has the missions along the first axis
+        params = [x.reshape((-1,)+(1,)*(I_sp.ndim-1)) for x in params]
+        return OHBModel_batch(I_sp, *params, eta=eta, launcher=launcher)[2]
+
+    #Bracketing on a grid over the Isp bounds and the data points of the Force-Power data
+    FPfunc, bounds = registry_ip1d('Data/FP_Isp'+eta+'.csv')
+    grid    = np.union1d(np.linspace(bounds[0], bounds[1], n_bracket), FPfunc.x)
+    n_grid  = len(grid)
+    values  = Teff(np.broadcast_to(grid, (m, n_grid)), params)
+    n_candidates = min(n_candidates, n_grid)
+    best    = np.argsort(-values, axis=1, kind='stable')[:, :n_candidates].ravel()  #Candidates of a mission are consecutive
+    a       = grid[np.maximum(best-1, 0)]
+    b       = grid[np.minimum(best+1, n_grid-1)]
+    params  = [np.repeat(x, n_candidates) for x in params]
+
+    #Golden section search on all brackets together, one new model evaluation per bracket per step
+    c       = b-R_GOLD*(b-a)
+    d       = a+R_GOLD*(b-a)
+    fc      = Teff(c, params)
+    fd      = Teff(d, params)
+    for i in range(maxiter):
+        if np.all(b-a <= tol):
+            break
+        left    = fc > fd                       #Maximum lies in [a,d]
+        a       = np.where(left, a, c)
+        b       = np.where(left, d, b)
+        x       = np.where(left, b-R_GOLD*(b-a), a+R_GOLD*(b-a))
+        fx      = Teff(x, params)
+        c, d    = np.where(left, x, d), np.where(left, c, x)
+        fc, fd  = np.where(left, fx, fd), np.where(left, fc, fx)
+
+    #Best evaluated point per bracket, including the grid point it was built around
+    I_sp    = np.stack([grid[best], c, d], axis=1)
+    T_eff   = np.stack([values.ravel()[np.repeat(np.arange(m)*n_grid, n_candidates)+best], fc, fd], axis=1)
+    #Best of all brackets of a mission
+    I_sp    = I_sp.reshape(m, -1)
+    T_eff   = T_eff.reshape(m, -1)
+    pick    = T_eff.argmax(axis=1)
+    rows    = np.arange(m)
+    return I_sp[rows, pick].reshape(shape), T_eff[rows, pick].reshape(shape)
+
+if __name__ == '__main__':
+    import time
+    start_time = time.time()
+    I_sp, T_eff = optimal_isp(2500., np.array([90., 180., 360.])*24*3600., 1000., 23222.*10**3, launcher='Soyuz')
+    print(f"Optimal Isp {I_sp} s with Transfer Efficiency {T_eff} %")
+    print(f"executed in {(time.time()-start_time)} seconds")
@@ -0,0 +1,74 @@
+from OHBModel import OHBModel_batch
+from multiprocessing import Pool
+from itertools import product
+from csv import writer
+import numpy as np
+
+
+def _sweep_chunk(task):
+    '''Evaluates one chunk of the sweep grid with the vectorized model and returns the csv rows'''
+    eta, launcher, tdays, Isps, P_sat, M_dry, R_f, R_inj_v, M_sep_v = task
+    Ri, Mi, Si = OHBModel_batch(I_sp=Isps, P_sat=P_sat, t_trans=tdays*24*3600., M_dry=M_dry, R_f=R_f, eta=eta, launcher=launcher, R_inj_v=R_inj_v, M_sep_v=M_sep_v)
+    return [[eta, launcher, td, Isp, R, M, S] for td, Isp, R, M, S in zip(tdays, Isps, Ri, Mi, Si)]
+
+
+def case_tasks(eta,launcher,tdays,Isps,P_sat=2500.,M_dry=1000.,R_f=23222.*10**3,R_inj_v=None,M_sep_v=None,chunksize=1000):
+    '''Splits the points of one eta/launcher case into chunks of at most chunksize points.
+    tdays and Isps are arrays of the transfer time [days] and Specific Impulse [s] of every point.
+    R_inj_v and M_sep_v optionally give the Injection Height [km] and Separation Mass [kg] of every point (see OHBModel_batch)'''
+    for i in range(0, len(Isps), chunksize):
+        chunk = slice(i, i+chunksize)
+        yield (eta, launcher, tdays[chunk], Isps[chunk], P_sat, M_dry, R_f,
+               None if R_inj_v is None else R_inj_v[chunk], None if M_sep_v is None else M_sep_v[chunk])
+
+
+def sweep_tasks(Isprange=(260,3600),step=20,tdays=(90,180,360),launchers=('Soyuz',),etas=('30',),P_sat=2500.,M_dry=1000.,R_f=23222.*10**3,chunksize=1000):
+    '''Splits the (eta x launcher x transfer time x Isp) grid into chunks of at most chunksize points.
+    Every chunk has a single eta and launcher, so it can be evaluated in one OHBModel_batch call.'''
+    (start, stop) = Isprange
+    Isps = np.arange(start, stop, step, dtype=float)
+    #Transfer time and Isp grid for one eta/launcher combination, Isp varying fastest
+    tgrid, Ispgrid = (a.ravel() for a in np.meshgrid(np.asarray(tdays, dtype=float), Isps, indexing='ij'))
+    for eta, launcher in product(etas, launchers):
+        yield from case_tasks(eta, launcher, tgrid, Ispgrid, P_sat, M_dry, R_f, chunksize=chunksize)
+
+
+def run_tasks(tasks,processes=None):
+    '''Evaluates the chunks of tasks on a pool of worker processes and yields their rows in task order.
+    processes = Amount of worker processes, defaults to the amount of cpus. With 1 no pool is started.'''
+    if processes == 1:
+        for task in tasks:
+            yield _sweep_chunk(task)
+    else:
+        with Pool(processes) as pool:
+            #imap keeps the order of the tasks while the chunks are evaluated in parallel
+            yield from pool.imap(_sweep_chunk, tasks)
+
+
+def parallel_sweep(savepath,Isprange=(260,3600),step=20,tdays=(90,180,360),launchers=('Soyuz',),etas=('30',),P_sat=2500.,M_dry=1000.,R_f=23222.*10**3,chunksize=1000,processes=None):
+    '''Runs OHBModel over the full (eta x launcher x transfer time x Isp) grid on a pool of worker processes.
+    Results are written to savepath in grid order as soon as they come in, one row per grid point.
+
+    savepath    = pathstring of the output csv file
+    Isprange    = (start, stop) of the Specific Impulse range in [s], stop not included
+    step        = Specific Impulse step in [s]
+    tdays       = Transfer times in [days]
+    launchers   = Launcher names (see OHBModel)
+    etas        = Thrust Efficiency options (see OHBModel)
+    P_sat, M_dry, R_f = Satellite Power [W], Dry Mass [kg] and Target Orbit [m], same for every grid point
+    chunksize   = Maximum amount of grid points evaluated by a worker in one go
+    processes   = Amount of worker processes, defaults to the amount of cpus. With 1 no pool is started.
+    '''
+    tasks = sweep_tasks(Isprange, step, tdays, launchers, etas, P_sat, M_dry, R_f, chunksize)
+    with open(savepath, 'w', newline='') as csvfile:
+        csvwrite = writer(csvfile)
+        csvwrite.writerow(['eta', 'Launcher', 'Transfer Time [d]', 'Isp', 'Inject Height', 'Sep. Mass', 'Trans. Eff.'])
+        for rows in run_tasks(tasks, processes):
+            csvwrite.writerows(rows)
+
+
+if __name__ == '__main__':
+    import time
+    start_time = time.time()
+    parallel_sweep('Data/Output/sweep.csv', step=5, launchers=('Ariane62','Ariane64','Soyuz'), etas=('30','50','70','100','Average'), Isprange=(300,3000))
+    print(f"executed in {(time.time()-start_time)} seconds")
@@ -0,0 +1,75 @@
+from typing import NamedTuple, Optional
+from dataregistry import registry_file
+import json
+
+
+class Satellite(NamedTuple):
+    '''Catalog entry of a satellite, with the "Unknown" values already resolved'''
+    SatelliteName: str
+    M_0: float              #Initial Wet Mass in [kg]
+    T_0: float              #Thrust in [N]
+    I_sp: float             #Specific Impulse in [s]
+    P_th: Optional[float]   #Thrust Phase Power in [W], None if unknown
+    M_u: float              #Payload Mass in [kg]
+    M_ps: float             #Propulsion System Mass in [kg]
+    M_st: float             #Structural Mass in [kg]
+    P_req: float            #Station Keeping Power in [W]
+    SatClass: str           #Classification
+
+
+def _known(value):
+    return None if value == "Unknown" else value
+
+
+def _resolve(entry):
+    '''Turns one json entry into a Satellite, replacing unknown GEO values with their typical values'''
+    M_0     = entry['Wet Mass']
+    M_u     = _known(entry['Payload Mass'])
+    M_ps    = _known(entry['Propulsion System Mass'])
+    M_st    = _known(entry['Structural Mass'])
+    P_req   = _known(entry['Station Keeping Power'])
+    if entry['Classification'] == "GEO":
+        if M_u is None:
+            M_u = 0.32*M_0
+        if M_st is None:
+            M_st = 0.3*M_0
+        if M_ps is None:
+            M_ps = 0.07*M_0
+        if P_req is None:
+            P_req = 691.
+    return Satellite(
+        SatelliteName   = entry['SatelliteName'],
+        M_0             = M_0,
+        T_0             = entry['Thrust'],
+        I_sp            = entry['Specific Impulse'],
+        P_th            = _known(entry['Thrust Power']),
+        M_u             = M_u,
+        M_ps            = M_ps,
+        M_st            = M_st,
+        P_req           = P_req,
+        SatClass        = entry['Classification'],
+    )
+
+
+def _build_catalog(path):
+    with open(path) as jsonfile:
+        Satdat = json.load(jsonfile)
+    return {entry['SatelliteName']: _resolve(entry) for entry in Satdat['Satellites']}
+
+
+def LoadCatalog(path='SatData.json'):
+    '''Returns a dictionary of all Satellites in the catalog by SatelliteName.
+    The file is parsed once per process and only again when it is modified.'''
+    return registry_file('satcatalog', path, lambda: _build_catalog(path))
+
+
+def GetSatellite(name,path='SatData.json'):
+    '''Returns the Satellite with the given SatelliteName from the catalog, or None if it is not in the catalog'''
+    sat = LoadCatalog(path).get(name)
+    if sat is not None and sat.P_th is None:
+        raise ValueError(f"Thrust Power needs to be known for {name}")
+    return sat
+
+
+if __name__ == '__main__':
+    print(LoadCatalog())
@@ -1,5 +1,4 @@
 from csv import reader
-import matplotlib.pyplot as plt
 
 def csvtodict(path,graph=False,give_names=False):
     datafile = list(reader(open(path)))
@@ -19,6 +18,8 @@ def csvtodict(path,graph=False,give_names=False):
         datafile[i] = list(filter(lambda x:x!='',row))
 
     if graph == True:
+        #Plotting only imported when needed, so the data can be loaded without matplotlib
+        import matplotlib.pyplot as plt
         fig, ax1 = plt.subplots()
         ax2 = ax1.twinx()
         ax1.set_xlabel('Specific Impulse [s]')
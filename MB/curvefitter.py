@@ -1,10 +1,8 @@
-import matplotlib.pyplot as plt
-from scipy.optimize import curve_fit
 from csv import reader
 from numpy import array, exp, arange, linspace
 
 
-def csvtocurve(func,path,param=None,graph=False,givepopt=False):
+def csvtocurve(func,path,param=None,graph=False,givepopt=False,givepcov=False):
     '''Returns function that approximates the csv data in the given path for a given function transform,
     CSV file needs to be two comma separated columns of X and Y data without headers or (empty) strings.
 
@@ -13,21 +11,27 @@ def csvtocurve(func,path,param=None,graph=False,givepopt=False):
     param   = list of first guesses for paramaters a,b,..   (Example: [1.0,0.1,0.8])
     grap    = if True returns graph of the datapoints and approximated curve as well as R2 value
     givepopt= if True returns function as well as list of optimal parameters
+    givepcov= if True also returns the covariance matrix of the optimal parameters (after popt if givepopt is True)
     '''
 
-    csvfile = open(path)
-    dataset = reader(csvfile)
-    Data = [[],[]]
-    for i in dataset:
-        Data[0].append(i[0])
-        Data[1].append(i[1])
+    with open(path) as csvfile:
+        dataset = reader(csvfile)
+        Data = [[],[]]
+        for i in dataset:
+            Data[0].append(i[0])
+            Data[1].append(i[1])
     DataX = array([float(i) for i in Data[0]])
     DataY = array([float(i) for i in Data[1]])
+    #Only imported when a fit is made, stored fits (see dataregistry) do not need scipy.optimize
+    from scipy.optimize import curve_fit
     if param != None:
         popt, pcov = curve_fit(func,DataX,DataY, p0=param)
-    popt, pcov = curve_fit(func,DataX,DataY)
+    else:
+        popt, pcov = curve_fit(func,DataX,DataY)
 
     if graph == True:
+        #Plotting only imported when needed, so the model can be used without matplotlib
+        import matplotlib.pyplot as plt
         xnew = linspace(DataX[0],DataX[-1],100)
         ynew = func(xnew,*popt)
         plt.plot(DataX,DataY,'o',xnew,ynew,'-')
@@ -42,6 +46,10 @@ def csvtocurve(func,path,param=None,graph=False,givepopt=False):
 
         R2 = 1-SSres/SStot
         print(f'R2 is {R2}')
+    if givepopt == True and givepcov == True:
+        return lambda x : func(x,*popt), popt, pcov
+    if givepcov == True:
+        return lambda x : func(x,*popt), pcov
     if  givepopt == True:
         return lambda x : func(x,*popt), popt
     if givepopt == False:
@@ -0,0 +1,108 @@
+from os import replace, getpid
+from os.path import abspath, getmtime, exists
+from hashlib import sha1
+from numpy import array
+from interpolate import csv_ip1d
+from curvefitter import csvtocurve
+import json
+
+#On-disk store of fitted curve coefficients, shared by all processes.
+#Entries are keyed by '<model form> <sha1 of the data file>' so a fit is only redone when the csv file content changes.
+COEFFICIENT_STORE = 'Data/CurveCoefficients.json'
+
+#Process-wide store of everything built from the data files.
+#Keys are (kind, absolute path, extra) and values are (mtime, result), so an entry is rebuilt when its file changes.
+_registry = {}
+
+
+def _lookup(kind, path, extra, build):
+    '''Returns the cached result for the given file or builds (and stores) it when missing or outdated'''
+    key = (kind, abspath(path), extra)
+    mtime = getmtime(path)
+    entry = _registry.get(key)
+    if entry is None or entry[0] != mtime:
+        entry = (mtime, build())
+        _registry[key] = entry
+    return entry[1]
+
+
+def registry_file(kind,path,build):
+    '''Returns build() for the given file, built once and only again when the file is modified.
+    kind is a name for what is built from the file, so several things can be cached for the same file.'''
+    return _lookup(kind, path, None, build)
+
+
+def registry_ip1d(path,switch=False):
+    '''Cached version of csv_ip1d, returns the interpolated function and its bounds.
+    The csv file is only read again when it is modified.
+
+    path    = pathstring                                    (Example: 'Data/datafile.csv')
+    switch  = if True plots x-values as y and vice versa
+    '''
+    return _lookup('ip1d', path, switch, lambda: csv_ip1d(path, bounds=True, switch=switch))
+
+
+def _read_store():
+    if not exists(COEFFICIENT_STORE):
+        return {}
+    with open(COEFFICIENT_STORE) as storefile:
+        return json.load(storefile)
+
+
+def _write_store(store):
+    #Write to a temporary file first so parallel workers never read a half written store
+    temppath = f'{COEFFICIENT_STORE}.{getpid()}.tmp'
+    with open(temppath, 'w') as storefile:
+        json.dump(store, storefile, indent=2)
+    replace(temppath, COEFFICIENT_STORE)
+
+
+def stored_coefficients(func,path,form):
+    '''Returns the optimal parameters and their covariance matrix for fitting func through the csv data in path.
+    They are read from the coefficient store if the data file has been fitted before with the same form,
+    otherwise csvtocurve is run and the result is added to the store.'''
+    with open(path, 'rb') as datafile:
+        filehash = sha1(datafile.read()).hexdigest()
+    key = f'{form} {filehash}'
+
+    store = _read_store()
+    if key not in store:
+        RtoM, popt, pcov = csvtocurve(func, path, givepopt=True, givepcov=True)
+        store = _read_store()
+        store[key] = {'path': path, 'popt': popt.tolist(), 'pcov': pcov.tolist()}
+        _write_store(store)
+    return array(store[key]['popt']), array(store[key]['pcov'])
+
+
+def _build_curve(func,path,form):
+    popt, pcov = stored_coefficients(func, path, form)
+    return lambda x : func(x,*popt), popt, pcov
+
+
+def registry_curve(func,path,form,givepcov=False):
+    '''Cached version of csvtocurve, returns the fitted function and the list of optimal parameters.
+    The coefficients are taken from the on-disk coefficient store, and the curve is only fitted again when the csv file is modified.
+
+    func    = function form                                 (Example: lambda x,a,b: a*x+b)
+    path    = pathstring                                    (Example: 'Data/datafile.csv')
+    form    = name of the function form, used to tell different fits of the same file apart (Example: 'poly3')
+              The name must be unique for each function form, since stored coefficients are looked up by it.
+    givepcov= if True also returns the covariance matrix of the optimal parameters
+    '''
+    function, popt, pcov = _lookup('curve', path, form, lambda: _build_curve(func, path, form))
+    if givepcov == True:
+        return function, popt, pcov
+    return function, popt
+
+
+def clear_registry():
+    '''Removes all cached tables, interpolators and fits'''
+    _registry.clear()
+
+
+if __name__ == '__main__':
+    import time
+    for i in range(2):
+        start_time = time.time()
+        f, popt = registry_curve(lambda x,a,b,c,d,e : a+b*x+c*x**2+d*x**3+e*x**4, 'Data/Launchers/Soyuz.csv', 'poly4')
+        print(f"Call {i} executed in {(time.time()-start_time)} seconds, {popt}")
@@ -1,7 +1,16 @@
 from scipy.optimize import newton
-from math import sqrt
+from math import sqrt, log as mlog, exp as mexp
+from bisect import bisect
+from numpy import asarray, sqrt as npsqrt, log, exp, interp, logspace, log10, where, abs as npabs, any as npany
 import time
 
+#Largest final/initial radius ratio in the table, the Hohmann DeltaV keeps increasing up to a ratio of about 15.58
+X_MAX = 15.
+
+#Table of the radius ratio as function of the dimensionless Hohmann DeltaV, built on first use
+_table = {}
+
+
 def GetRadius(Ri,DV,mu):
 
     def f(Rf):
@@ -9,8 +18,78 @@ def GetRadius(Ri,DV,mu):
 
     return newton(f,Ri)
 
+
+def HohmannRatioDV(x):
+    '''Hohmann DeltaV divided by the initial circular velocity sqrt(mu/Ri), for the radius ratio x = Rf/Ri'''
+    return (2*x/(1+x))**0.5-1+(1-(2/(1+x))**0.5)/x**0.5
+
+
+def HohmannRatioDVDerivative(x):
+    '''Derivative of HohmannRatioDV to the radius ratio x'''
+    s1 = (2*x/(1+x))**0.5
+    s2 = (2/(1+x))**0.5
+    return 1/((1+x)**2*s1)-0.5*(1-s2)/x**1.5+1/(x**0.5*(1+x)**2*s2)
+
+
+def RadiusTable(n=2000):
+    '''Builds (once) the table of log(x-1) against log(HohmannRatioDV(x)) on a geometric grid of x-1.
+    Returns the table and the maximum relative error in x-1 of the linear table lookup,
+    measured halfway between the grid points, which bounds the error before the Newton polishing in GetRadiusTable.'''
+    if n not in _table:
+        xm1     = logspace(-9, log10(X_MAX-1), n)             #x-1 grid
+        logg    = log(HohmannRatioDV(1+xm1))
+        logxm1  = log(xm1)
+        #Error of the lookup halfway between the table points
+        xm1_mid = npsqrt(xm1[1:]*xm1[:-1])
+        guess   = exp(interp(log(HohmannRatioDV(1+xm1_mid)), logg, logxm1))
+        error   = (npabs(guess-xm1_mid)/xm1_mid).max()
+        _table[n] = (logg, logxm1, error, list(logg), list(logxm1))
+    return _table[n][:3]
+
+
+def GetRadiusTable(Ri,DV,mu,newtonsteps=2):
+    '''Final orbit radius after a Hohmann transfer with DeltaV DV from radius Ri, without a root-finder.
+    The dimensionless DeltaV DV/sqrt(mu/Ri) only depends on the radius ratio Rf/Ri, so the ratio is read from a
+    precomputed log-log table and polished with a few Newton steps. Works on scalars and arrays.
+
+    Ri      = Initial Orbit Radius in [m]
+    DV      = DeltaV in [m/s]
+    mu      = Gravitational Parameter in [m3/s2]
+    newtonsteps = Amount of Newton steps after the table lookup (each roughly squares the relative error)
+    '''
+    logg, logxm1, error = RadiusTable()
+    g       = DV/(mu/Ri)**0.5
+    if isinstance(g, float):
+        x   = _ratio_scalar(g, logg)
+    else:
+        g   = asarray(g, dtype=float)
+        if npany(g>exp(logg[-1])) or npany(g<0):
+            raise ValueError(f"DeltaV must be between 0 and {exp(logg[-1]):.4f} times the circular velocity for the radius table")
+        #Below the table the DeltaV is linear in x-1 with slope 1/2
+        intable = g>=exp(logg[0])
+        x   = 1+where(intable, exp(interp(log(where(intable, g, 1.)), logg, logxm1)), 2*g)
+    for i in range(newtonsteps):
+        x   -= (HohmannRatioDV(x)-g)/HohmannRatioDVDerivative(x)
+    return x*Ri
+
+
+def _ratio_scalar(g, logg):
+    '''Table lookup for a single float, without the numpy overhead of GetRadiusTable's array path'''
+    loggl, logxm1l = _table[len(logg)][3:]
+    if not 0 <= g <= exp(loggl[-1]):
+        raise ValueError(f"DeltaV must be between 0 and {exp(loggl[-1]):.4f} times the circular velocity for the radius table")
+    if g < exp(loggl[0]):
+        return 1+2*g
+    lg  = mlog(g)
+    j   = min(bisect(loggl, lg), len(loggl)-1)
+    w   = (lg-loggl[j-1])/(loggl[j]-loggl[j-1])
+    return 1+mexp(logxm1l[j-1]+w*(logxm1l[j]-logxm1l[j-1]))
+
+
 if __name__ == '__main__':
     starttime = time.time()
     print(GetRadius(10000.0,23546.214671053374,(398600.*10**9)))
     # time = time.time()-starttime
     # print(time)
+    print(GetRadiusTable(6778000., 100., 398600.*10**9), GetRadius(6778000., 100., 398600.*10**9))
+    print('Maximum relative table error before polishing', RadiusTable()[2])
@@ -0,0 +1,73 @@
+from numpy import genfromtxt, isnan, concatenate, cumsum, argsort, asarray, interp, empty, nan
+from csv import reader
+from dataregistry import registry_file
+
+
+class FigureData(object):
+    '''Columnar version of the Wollenhaupt figure data (Fig3/4/5Wollenhaupt.csv layout).
+    All series are stored after each other in two contiguous arrays X and Y, sorted on X per series.
+    Series i occupies X[offsets[i]:offsets[i+1]].
+
+    names   = series names in file order (Example: 'Inject Height 90 d')
+    index   = dictionary from series name to series number
+    '''
+
+    def __init__(self, names, xcolumns, ycolumns):
+        self.names = list(names)
+        self.index = {name: i for i, name in enumerate(self.names)}
+        orders = [argsort(x, kind='stable') for x in xcolumns]
+        self.X = concatenate([x[order] for x, order in zip(xcolumns, orders)])
+        self.Y = concatenate([y[order] for y, order in zip(ycolumns, orders)])
+        self.offsets = concatenate([[0], cumsum([len(x) for x in xcolumns])])
+
+    def series(self, name):
+        '''Returns the X and Y data of one series (as views of the contiguous arrays)'''
+        i = self.index[name]
+        start, stop = self.offsets[i], self.offsets[i+1]
+        return self.X[start:stop], self.Y[start:stop]
+
+    def bounds(self, name):
+        '''Returns the X range of one series'''
+        X, Y = self.series(name)
+        return X[0], X[-1]
+
+    def interpolate(self, grid, names=None):
+        '''Linear interpolation of the given series (default all) at a common grid, for example an Isp range.
+        Returns an array with one row per series, points outside a series' X range are nan.'''
+        grid = asarray(grid, dtype=float)
+        names = self.names if names is None else names
+        values = empty((len(names),) + grid.shape)
+        for row, name in enumerate(names):
+            X, Y = self.series(name)
+            values[row] = interp(grid, X, Y, left=nan, right=nan)
+        return values
+
+
+def _build_figuredata(path):
+    with open(path) as csvfile:
+        header = next(reader(csvfile))
+    names = [name for name in header if name != '']
+    #Empty strings (shorter series) become nan and are dropped per column
+    data = genfromtxt(path, delimiter=',', skip_header=2, ndmin=2)
+    xcolumns, ycolumns = [], []
+    for i in range(len(names)):
+        X, Y = data[:, 2*i], data[:, 2*i+1]
+        keep = ~(isnan(X) | isnan(Y))
+        xcolumns.append(X[keep])
+        ycolumns.append(Y[keep])
+    return FigureData(names, xcolumns, ycolumns)
+
+
+def load_figuredata(path):
+    '''Parses a Wollenhaupt figure csv file once into a FigureData, again only when the file is modified.
+
+    path    = pathstring (Example: 'Data/Fig3Wollenhaupt.csv')
+    '''
+    return registry_file('figuredata', path, lambda: _build_figuredata(path))
+
+
+if __name__ == '__main__':
+    from numpy import arange
+    data = load_figuredata('Data/Fig3Wollenhaupt.csv')
+    print(data.names)
+    print(data.interpolate(arange(260, 3600, 20))[:, :5])
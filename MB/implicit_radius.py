@@ -1,26 +1,39 @@
 from openmdao.api import ImplicitComponent
-from math import sqrt
+from numpy import sqrt, arange
+from fasterimplicitradius import HohmannRatioDV, HohmannRatioDVDerivative
 class RadiusComp(ImplicitComponent):
     """"Calculates the Radius for a given DeltaV increment"""
     def initialize(self):
         self.options.declare('mu', default=(398600.*10**9), types=float) #Gravitational Parameter Central Body (Default Earth) in [m3/s2]
+        self.options.declare('n', default=1, types=int)                  #Amount of independent DeltaV, Radius pairs solved together
     def setup(self):
+        n = self.options['n']
         #input
-        self.add_input('DeltaV', units='m/s', desc='Change in Velocity')
-        self.add_input('R_i',units='m',desc='Orbit Radius after DV change')
+        self.add_input('DeltaV', shape=n, units='m/s', desc='Change in Velocity')
+        self.add_input('R_i', shape=n, units='m',desc='Orbit Radius after DV change')
         #outputs
-        self.add_output('R_f',units='m',desc='Orbit Radius after DV change')
+        self.add_output('R_f', shape=n, units='m',desc='Orbit Radius after DV change')
 
-        self.declare_partials(of='*',wrt='*', method='fd')
+        #Every pair only depends on itself, so all partials are diagonal
+        self.declare_partials(of='*',wrt='*', rows=arange(n), cols=arange(n))
 
     def apply_nonlinear(self, inputs, outputs, residuals):
         R_i = inputs['R_i']
         mu = self.options['mu']
         R_f = outputs['R_f']
         residuals['R_f'] = sqrt(mu/R_i)*(sqrt(2*R_f/(R_f+R_i))-1.)+sqrt(mu/R_f)*(1-sqrt(2*R_i/(R_f+R_i)))-inputs['DeltaV']
+    def linearize(self, inputs, outputs, partials):
+        #Residual written as sqrt(mu/R_i)*HohmannRatioDV(R_f/R_i)-DeltaV
+        R_i = inputs['R_i']
+        mu = self.options['mu']
+        x = outputs['R_f']/R_i
+        v_i = sqrt(mu/R_i)
+        dgdx = HohmannRatioDVDerivative(x)
+        partials['R_f','R_f'] = v_i*dgdx/R_i
+        partials['R_f','R_i'] = -0.5*v_i*HohmannRatioDV(x)/R_i-v_i*dgdx*x/R_i
+        partials['R_f','DeltaV'] = -1.
     def guess_nonlinear(self, inputs, outputs, residuals):
-        R_i = float(inputs['R_i'])
-        outputs['R_f'] = R_i
+        outputs['R_f'] = inputs['R_i']
 
 #Verification Test
 if __name__ == '__main__':
@@ -28,7 +41,7 @@ if __name__ == '__main__':
     p = Problem()
     model = p.model = Group()
     model.add_subsystem('radius',RadiusComp(), promotes=['*'])
-    model.nonlinear_solver = NewtonSolver(maxiter = 30, iprint = 2, atol=1e-10, rtol=1e-12)
+    model.nonlinear_solver = NewtonSolver(maxiter = 30, iprint = 2, atol=1e-10, rtol=1e-12, solve_subsystems=False)
     model.linear_solver = ScipyKrylov()
     p.setup()
     p['R_i'] = 6778000
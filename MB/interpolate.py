@@ -1,4 +1,3 @@
-import matplotlib.pyplot as plt
 from scipy.interpolate import interp1d
 from csv import reader
 from numpy import array, exp, arange
@@ -14,12 +13,12 @@ def csv_ip1d(path,graph=False,bounds=False,switch=False):
     bounds  = if True returns boundaries of the interpolated function as well as the function
     switch  = if True plots x-values as y and vice versa
     '''
-    csvfile = open(path)
-    dataset = reader(csvfile)
-    Data = [[],[]]
-    for i in dataset:
-        Data[0].append(i[0])
-        Data[1].append(i[1])
+    with open(path) as csvfile:
+        dataset = reader(csvfile)
+        Data = [[],[]]
+        for i in dataset:
+            Data[0].append(i[0])
+            Data[1].append(i[1])
     DataX = array([float(i) for i in Data[0]])
     DataY = array([float(i) for i in Data[1]])
     if switch == True:
@@ -27,6 +26,8 @@ def csv_ip1d(path,graph=False,bounds=False,switch=False):
     function = interp1d(DataX,DataY)
 
     if graph == True:
+        #Plotting only imported when needed, so the model can be used without matplotlib
+        import matplotlib.pyplot as plt
         xnew = arange(DataX[0],DataX[-1],1)
         ynew = function(xnew)
         plt.plot(DataX,DataY,'o',xnew,ynew,'-')
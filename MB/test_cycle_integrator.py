@@ -0,0 +1,26 @@
+import unittest
+import numpy as np
+from CycleIntegrator import CycleCount, CycleCountLoop, U_MAX
+
+
+class CycleCountTest(unittest.TestCase):
+    def test_loop(self):
+        t_dc, T_0, DV_tot, v_e = np.meshgrid(np.linspace(2000., 1.5e6, 60), [0.015, 0.2, 1.], [10., 1000., 3000.], [3000., 9810., 30000.], indexing='ij')
+        #Mass fraction spent in a cycle at the final mass, both sides of the switch to the loop are in the grid
+        u_f = T_0*t_dc/(v_e*150.*np.exp(-DV_tot/v_e))
+        self.assertTrue((u_f < U_MAX).any() and (u_f > U_MAX).any())
+        self.assertTrue(((u_f > 0.2) & (u_f < U_MAX)).any())
+
+        cycle, dcycle = CycleCount(t_dc, T_0, DV_tot, v_e, givederiv=True)
+        loop, dloop = CycleCountLoop(t_dc, T_0, DV_tot, v_e, givederiv=True)
+        np.testing.assert_allclose(cycle, loop, rtol=1e-11)
+        np.testing.assert_allclose(dcycle, dloop, rtol=1e-11)
+
+    def test_scalar(self):
+        cycle, dcycle = CycleCount(20000., 0.015, 1000., 9810., givederiv=True)
+        self.assertIsInstance(cycle, float)
+        self.assertAlmostEqual(cycle, float(CycleCountLoop(20000., 0.015, 1000., 9810.)), places=9)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import unittest
+from openmdao.api import Problem
+from MBGroup import MBGroup
+from Memoize import EvaluationCache
+
+
+class MemoizeTest(unittest.TestCase):
+    def run_group(self, cache_size, points):
+        prob = Problem()
+        prob.model = MBGroup(cache_size=cache_size)
+        prob.setup()
+        results = []
+        for M_batt, M_sa in points:
+            prob['M_batt'] = M_batt
+            prob['M_sa'] = M_sa
+            prob.run_model()
+            totals = prob.compute_totals(of=['t_tot'], wrt=['M_batt', 'M_sa'])
+            results.append((prob['t_tot'][0], totals['t_tot', 'M_batt'][0][0], totals['t_tot', 'M_sa'][0][0]))
+        return prob, results
+
+    def test_same_results(self):
+        points = [(20., 30.), (21., 30.), (20., 30.), (20., 30.+1e-14)]
+        cached, cached_results = self.run_group(8, points)
+        plain, plain_results = self.run_group(0, points)
+        self.assertEqual(cached_results, plain_results[:3]+[cached_results[0]])
+        info = cached.model.cache_info()['OrbitCycle']
+        #Third and fourth point are the same as the first one after rounding
+        self.assertEqual(info['compute']['misses'], 2)
+        self.assertEqual(info['partials']['hits'], 2)
+        self.assertEqual(plain.model.cache_info(), {})
+
+    def test_lru(self):
+        cache = EvaluationCache(maxsize=2)
+        for key in ['a', 'b', 'a', 'c']:
+            if cache.get(key) is None:
+                cache.put(key, key)
+        #'b' was used least recently, so it was removed when 'c' was added
+        self.assertEqual(list(cache.store), ['a', 'c'])
+        self.assertEqual((cache.hits, cache.misses), (1, 3))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,35 @@
+import unittest
+import numpy as np
+from OHBModel import OHBModel, OHBModel_batch
+from OptimalIsp import optimal_isp
+from dataregistry import registry_ip1d
+
+
+class OptimalIspTest(unittest.TestCase):
+    def test_dense_sweep(self):
+        P_sat = np.array([500., 2500., 10000.])[:, None]
+        t_trans = np.array([10., 90., 360.])[None, :]*24*3600.
+        I_sp, T_eff = optimal_isp(P_sat, t_trans, 1000., 23222.*10**3)
+        self.assertEqual(I_sp.shape, (3, 3))
+
+        bounds = registry_ip1d('Data/FP_Isp30.csv')[1]
+        grid = np.linspace(bounds[0], bounds[1], 100001)
+        for i in range(3):
+            for j in range(3):
+                dense = OHBModel_batch(grid, P_sat[i, 0], t_trans[0, j], 1000., 23222.*10**3, launcher='Soyuz')[2]
+                #At least as good as the best point of the dense sweep
+                self.assertGreater(T_eff[i, j], np.nanmax(dense)-1e-9)
+                self.assertAlmostEqual(T_eff[i, j], OHBModel(I_sp[i, j], P_sat[i, 0], t_trans[0, j], 1000., 23222.*10**3, launcher='Soyuz')[2], places=10)
+
+    def test_bound(self):
+        #With a lot of power and time the best Isp is the upper bound of the Force-Power data
+        bounds = registry_ip1d('Data/FP_Isp30.csv')[1]
+        I_sp, T_eff = optimal_isp(10000., 360.*24*3600., 1000., 23222.*10**3)
+        self.assertEqual(float(I_sp), bounds[1])
+        grid = np.linspace(bounds[0], bounds[1], 100001)
+        dense = OHBModel_batch(grid, 10000., 360.*24*3600., 1000., 23222.*10**3, launcher='Soyuz')[2]
+        self.assertEqual(float(T_eff), np.nanmax(dense))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,36 @@
+import unittest
+import numpy as np
+from OHBModel import OHBModel
+from ParallelSweep import case_tasks, run_tasks, sweep_tasks
+
+
+class ParallelSweepTest(unittest.TestCase):
+    def serial(self, rows):
+        #Same points with the scalar model, one call per point
+        return [[eta, launcher, td, Isp]+list(OHBModel(Isp, 2500., td*24*3600., 1000., 23222.*10**3, eta=eta, launcher=launcher))
+                for eta, launcher, td, Isp, R, M, S in rows]
+
+    def test_grid(self):
+        tasks = list(sweep_tasks(Isprange=(300,3000), step=150, tdays=(90,180), launchers=('Ariane62','Soyuz'), etas=('30','Average'), chunksize=7))
+        serial = [row for chunk in run_tasks(tasks, processes=1) for row in chunk]
+        parallel = [row for chunk in run_tasks(tasks, processes=2) for row in chunk]
+        self.assertEqual(len(serial), 2*2*2*18)
+        self.assertEqual(parallel, serial)
+        expected = self.serial(serial)
+        self.assertEqual([row[:4] for row in serial], [row[:4] for row in expected])
+        np.testing.assert_allclose([row[4:] for row in serial], [row[4:] for row in expected], rtol=1e-12)
+
+    def test_given(self):
+        #Given Injection Heights [km] and Separation Masses [kg] instead of a launcher
+        Isps = np.arange(300., 3000., 300.)
+        R_inj = np.linspace(400., 2000., len(Isps))
+        M_sep = np.linspace(1500., 3000., len(Isps))
+        tasks = case_tasks('30', None, np.full(len(Isps), 90.), Isps, R_inj_v=R_inj, M_sep_v=M_sep, chunksize=4)
+        rows = [row for chunk in run_tasks(tasks, processes=2) for row in chunk]
+        for row, Isp, R, M in zip(rows, Isps, R_inj, M_sep):
+            expected = OHBModel(Isp, 2500., 90*24*3600., 1000., 23222.*10**3, R_inj_v=R, M_sep_v=M)
+            np.testing.assert_allclose(row[4:], expected, rtol=1e-12)
+
+
+if __name__ == '__main__':
+    unittest.main()
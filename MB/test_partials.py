@@ -0,0 +1,50 @@
+import unittest
+from openmdao.api import Problem, Group
+from openmdao.utils.assert_utils import assert_check_partials
+from MB1 import MB1Comp
+from MB2 import MB2Comp
+from MB3 import MB3Comp
+from MBGroup import MBGroup
+
+
+class PartialsTest(unittest.TestCase):
+    def check_component(self, comp, values):
+        prob = Problem()
+        prob.model = Group()
+        prob.model.add_subsystem('test1', comp, promotes=['*'])
+        prob.setup()
+        for name, value in values.items():
+            prob[name] = value
+        prob.run_model()
+        data = prob.check_partials(out_stream=None, method='fd', form='central', step_calc='rel')
+        assert_check_partials(data, atol=1e-4, rtol=1e-5)
+
+    def test_MB1(self):
+        self.check_component(MB1Comp(), {'M_batt': 20., 'M_sa': 30.})
+
+    def test_MB2(self):
+        self.check_component(MB2Comp(), {'P_sa': 1822.76785714, 'C_batt': 234000.})
+
+    def test_MB3(self):
+        #Many short cycles, and a few long cycles where the overshoot correction is a large part of the cycle count
+        for t_dc in [795.6, 50000., 3.*10**6]:
+            self.check_component(MB3Comp(), {'t_c': 135.8279347, 't_dc': t_dc})
+
+    def test_MB3_loop(self):
+        #A single cycle spends more than U_MAX of the mass, so the cycles are iterated
+        self.check_component(MB3Comp(), {'t_c': 135.8279347, 't_dc': 4.*10**7})
+
+    def test_totals(self):
+        prob = Problem()
+        prob.model = MBGroup()
+        prob.setup()
+        prob['M_batt'] = 20.
+        prob['M_sa'] = 30.
+        prob.run_model()
+        data = prob.check_totals(of=['t_tot', 'constraint1'], wrt=['M_batt', 'M_sa'], form='central', step=1e-3, out_stream=None)
+        for key, value in data.items():
+            self.assertLess(value['rel error'].forward, 1e-5, key)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+import numpy as np
+from fasterimplicitradius import GetRadius, GetRadiusTable, HohmannRatioDV, HohmannRatioDVDerivative, RadiusTable, X_MAX
+from GetHohmannRadius import HohmannRadiusSolver
+
+#Same gravitational parameter as the default of RadiusComp
+mu = 398600.*10**9
+
+
+class RadiusTableTest(unittest.TestCase):
+    def test_table_range(self):
+        R_i = 6778000.
+        #Radius ratios over the whole table range, including below its first point (x-1 < 1e-9)
+        x = 1+np.concatenate([[1e-11, 5e-10], np.logspace(-8, np.log10(X_MAX-1.5), 40)])
+        DV = HohmannRatioDV(x)*(mu/R_i)**0.5
+        table = GetRadiusTable(R_i, DV, mu)
+        np.testing.assert_allclose(table, x*R_i, rtol=1e-13)
+        #The secant iterations of GetRadius (started at R_i) only converge up to a radius ratio of about 5
+        newton = np.array([GetRadius(R_i, dv, mu) for dv in DV[x < 4.]])
+        np.testing.assert_allclose(table[x < 4.], newton, rtol=1e-11)
+        np.testing.assert_allclose(table[2:], HohmannRadiusSolver().solve_batch(DV[2:], R_i), rtol=1e-10)
+
+    def test_scalar(self):
+        #Single floats take the bisect lookup of _ratio_scalar, also between the table points and below the table
+        logg = RadiusTable()[0]
+        g = np.concatenate([[1e-12, np.exp(logg[0])], np.sqrt(np.exp(logg[1:]+logg[:-1]))[::97], [np.exp(logg[-1])]])
+        for R_i in [6778000., 42164000.]:
+            for value in g:
+                DV = float(value*(mu/R_i)**0.5)
+                radius = GetRadiusTable(R_i, DV, mu)
+                self.assertIsInstance(radius, float)
+                self.assertAlmostEqual(radius/GetRadiusTable(R_i, np.array([DV]), mu)[0], 1., places=13)
+                if radius < 4.*R_i:
+                    self.assertAlmostEqual(radius/GetRadius(R_i, DV, mu), 1., places=10)
+        with self.assertRaises(ValueError):
+            GetRadiusTable(6778000., float(1.01*np.exp(logg[-1])*(mu/6778000.)**0.5), mu)
+
+    def test_hohmann_problems(self):
+        solver = HohmannRadiusSolver(maxsize=2)
+        single = solver.solve(100., 6778000.)
+        for n in [1, 2, 3, 2]:
+            R_f = solver.solve_batch([100.]*n, 6778000.)
+            self.assertEqual(R_f.shape, (n,))
+            self.assertAlmostEqual(R_f[0], single, places=4)
+        #Only the Problems of the last 2 sizes are kept
+        self.assertEqual(list(solver.problems), [3, 2])
+
+    def test_derivative(self):
+        x = np.linspace(1.001, X_MAX, 200)
+        h = 1e-6*x
+        fd = (HohmannRatioDV(x+h)-HohmannRatioDV(x-h))/(2*h)
+        np.testing.assert_allclose(HohmannRatioDVDerivative(x), fd, rtol=1e-7, atol=1e-10)
+
+
+if __name__ == '__main__':
+    unittest.main()
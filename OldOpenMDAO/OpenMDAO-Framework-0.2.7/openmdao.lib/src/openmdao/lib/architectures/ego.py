@@ -55,6 +55,8 @@ class EGO(Architecture):
         #add in the metamodel
         meta_model = self.parent.add(self.comp_name,MetaModel()) #metamodel now replaces old component with same name
         meta_model.surrogate = {'default':KrigingSurrogate()}
+        #retrained after every infill point, so start from the last fit
+        meta_model.surrogate_args = {'default':{'warm_start':True}}
         meta_model.model = self.comp
         
         meta_model_recorder = DBCaseRecorder(os.path.join(self._tdir,'trainer.db'))
@@ -8,7 +8,7 @@ from openmdao.main.api import Component, Case
 from openmdao.lib.datatypes.api import Slot, ListStr, Event, \
      List, Str, Dict, Bool
 from openmdao.main.interfaces import IComponent, ISurrogate, ICaseRecorder, \
-     ICaseIterator
+     ICaseIterator, IIncrementalSurrogate
 from openmdao.main.uncertain_distributions import UncertainDistribution, \
                                                   NormalDistribution
 from openmdao.main.mp_support import has_interface
@@ -72,6 +72,8 @@ class MetaModel(Component):
         self._train = False
         self._new_train_data = False
         self._failed_training_msgs = []
+        self._n_trained = 0 # number of training cases the surrogates have seen
+        self._trained_const = set() # constant inputs at the last training
      
         # the following line will work for classes that inherit from MetaModel
         # as long as they declare their traits in the class body and not in
@@ -88,6 +90,7 @@ class MetaModel(Component):
         self._training_input_history = []
         self._const_inputs = {}
         self._failed_training_msgs = []
+        self._n_trained = 0
         
         # remove output history from surrogate_info
         for name, tup in self._surrogate_info.items():
@@ -194,10 +197,23 @@ class MetaModel(Component):
                                                        if i not in self._const_inputs])
                 else:
                     training_input_history = self._training_input_history
+                    
+                # surrogates that support it are only given the cases added 
+                # since the last training, as long as the same inputs are 
+                # left out as constants
+                n_trained = self._n_trained
+                incremental = 0 < n_trained < len(training_input_history) and \
+                              set(self._const_inputs) == self._trained_const
                 for name,tup in self._surrogate_info.items(): 
                     surrogate, output_history = tup  
-                    surrogate.train(training_input_history, output_history)
+                    if incremental and has_interface(surrogate, IIncrementalSurrogate): 
+                        surrogate.add_training_data(training_input_history[n_trained:], 
+                                                    output_history[n_trained:])
+                    else: 
+                        surrogate.train(training_input_history, output_history)
                     
+                self._n_trained = len(training_input_history)
+                self._trained_const = set(self._const_inputs)
                 self._new_train_data = False
                 
             inputs = []
@@ -252,6 +268,7 @@ class MetaModel(Component):
         self._training_input_history = []
         self._surrogate_info = {}
         self._failed_training_msgs = []
+        self._n_trained = 0
         
         # remove traits promoted from the old model
         for name in self._current_model_traitnames:
@@ -6,7 +6,8 @@ from enthought.traits.api import HasTraits
 
 from openmdao.lib.datatypes.api import Float
 from openmdao.main.api import Assembly, Component, set_as_top, Case
-from openmdao.main.interfaces import implements, ICaseRecorder
+from openmdao.main.interfaces import implements, ICaseRecorder, \
+                                    IIncrementalSurrogate
 
 from openmdao.main.uncertain_distributions import NormalDistribution
 
@@ -26,6 +27,21 @@ class DumbRecorder(HasTraits):
         pass
 
 
+class IncrementalSurrogate(object):
+    """Records how it was trained."""
+    implements(IIncrementalSurrogate)
+    def __init__(self):
+        self.calls = []
+    def get_uncertain_value(self, value): 
+        return value
+    def train(self, X, Y): 
+        self.calls.append(('train', len(X), len(X[0])))
+    def add_training_data(self, X, Y): 
+        self.calls.append(('add', len(X), len(X[0])))
+    def predict(self, X): 
+        return 0.
+
+
 class Simple(Component):
     
     a = Float(iotype='in')
@@ -268,6 +284,42 @@ class MetaModelTestCase(unittest.TestCase):
         self.assertEqual(metamodel2.c.getvalue(), simple.c)
         self.assertEqual(metamodel2.d.getvalue(), simple.d)        
         
+    def test_incremental_training(self): 
+        metamodel = MetaModel()
+        metamodel.name = 'meta'
+        metamodel.surrogate = {'default':IncrementalSurrogate()}
+        metamodel.model = Simple()
+        metamodel.recorder = DumbRecorder()
+        calls = metamodel._surrogate_info['c'][0].calls
+        
+        def train(cases): 
+            for a,b in cases: 
+                metamodel.a = a
+                metamodel.b = b
+                metamodel.train_next = True
+                metamodel.run()
+            metamodel.a = 2.5
+            metamodel.b = 2.
+            metamodel.run()
+        
+        train([(1.,2.),(3.,2.),(4.,2.)])
+        self.assertEqual(calls, [('train', 3, 1)])
+        
+        # only the new cases are added
+        train([(2.,2.),(5.,2.)])
+        self.assertEqual(calls[-1], ('add', 2, 1))
+        
+        # b is not constant anymore, so train on all cases
+        train([(2.,3.)])
+        self.assertEqual(calls[-1], ('train', 6, 2))
+        
+        train([(6.,1.)])
+        self.assertEqual(calls[-1], ('add', 1, 2))
+        
+        metamodel.reset_training_data = True
+        train([(1.,2.),(3.,4.)])
+        self.assertEqual(calls[-1], ('train', 2, 2))
+        
     def test_default_execute(self):
         metamodel = MetaModel()
         metamodel.name = 'meta'
@@ -19,11 +19,11 @@
 
 import logging
 from random import randint, shuffle
+from multiprocessing import Pool
 
 # pylint: disable-msg=E0611,F0401
 try:
-    from numpy import array, size, sum, floor, zeros
-    from numpy.linalg import norm
+    from numpy import array, size, sum, floor, zeros, abs, newaxis, arange
 except ImportError as err:
     logging.warn("In %s: %r" % (__file__, err))
 
@@ -77,52 +77,90 @@ def is_latin_hypercube(lh):
     return True
 
 
+def _distance_terms(doe, rows, q, p):
+    """Returns the terms d**(-q) of the Morris-Mitchell criterion for the 
+    distances (p-norm) between the given rows of the DOE and all its rows.
+    The terms of a point with itself are zero."""
+    dist = zeros((len(rows), len(doe)))
+    for col in range(doe.shape[1]):
+        diff = abs(doe[rows, col][:, newaxis]-doe[newaxis, :, col])
+        dist += diff if p == 1 else diff**p
+    if p != 1:
+        dist **= 1.0/p
+    dist[arange(len(rows)), rows] = 1.
+    terms = dist**(-q)
+    terms[arange(len(rows)), rows] = 0.
+    return terms
+    
+
+def _update_terms(terms, doe, rows, q, p):
+    """Replaces the terms of the given rows (and columns) of a copy of the 
+    terms matrix of a parent DOE with the terms of the changed DOE."""
+    terms = terms.copy()
+    rows_terms = _distance_terms(doe, rows, q, p)
+    terms[rows, :] = rows_terms
+    terms[:, rows] = rows_terms.T
+    return terms
+
+
+def _offspring_phis(args):
+    """Morris-Mitchell criterion of a batch of offspring of one parent, 
+    given as (doe, changed rows) pairs. Used by the worker processes."""
+    terms, offspring, q, p = args
+    return [(_update_terms(terms, doe, rows, q, p).sum()/2.)**(1.0/q) 
+            for doe, rows in offspring]
+
+
 @stub_if_missing_deps('numpy')
 class LHC_indivudal(object):
     
-    def __init__(self, doe, q=2, p=1):
+    def __init__(self, doe, q=2, p=1, parent=None, rows=None):
         self.q = q
         self.p = p
         self.doe = doe
         self.phi = None # Morris-Mitchell sampling criterion
+        #matrix of the terms d**(-q) for all pairs of points, a perturbed 
+        #DOE only recalculates the rows of the points that were changed 
+        #with respect to its parent
+        self._terms = None
+        self._parent = parent
+        self._rows = rows
     
     @property
     def shape(self):
         """Size of the LatinHypercube DOE (rows,cols)."""
         return self.doe.shape
     
+    def get_terms(self):
+        """Returns the matrix of the terms d**(-q) of all pairs of points."""
+        if self._terms is None:
+            parent = self._parent
+            if parent is not None and (parent._terms is not None or parent._parent is not None):
+                self._terms = _update_terms(parent.get_terms(), self.doe, self._rows, 
+                                            self.q, self.p)
+            else:
+                self._terms = _distance_terms(self.doe, arange(len(self.doe)), 
+                                              self.q, self.p)
+            self._parent = None
+        return self._terms
+    
     def mmphi(self):
         """Returns the Morris-Mitchell sampling criterion for this Latin hypercube."""
 
         if self.phi is None:
-            n,m = self.doe.shape
-            distdict = {}
-            
-            #calculate the norm between each pair of points in the DOE
-            # TODO: This norm takes up the majority of the computation time. It
-            # should be converted to C or ShedSkin.
-            arr = self.doe
-            for i in range(n):
-                for j in range(i+1, n):
-                    nrm = norm(arr[i]-arr[j], ord=self.p)
-                    distdict[nrm] = distdict.get(nrm, 0) + 1
-    
-            distinct_d = array(distdict.keys())
-            
-            #mutltiplicity array with a count of how many pairs of points have a given distance
-            J = array(distdict.values())
-            
-            self.phi = sum(J*(distinct_d**(-self.q)))**(1.0/self.q)
+            #every pair is in the terms matrix twice
+            self.phi = (self.get_terms().sum()/2.)**(1.0/self.q)
         
         return self.phi
     
     def perturb(self, mutation_count):
-        """ Interchanges pairs of randomly chosen elements within randomly chosen
+        """ Interchanges pairs of randomly chosen elements within randomly chosen
         columns of a DOE a number of times. The result of this operation will also 
         be a Latin hypercube.
         """
         new_doe = self.doe.copy()
         n,k = self.doe.shape
+        rows = set()
         for count in range(mutation_count): 
             col = randint(0, k-1)
             
@@ -134,8 +172,10 @@ class LHC_indivudal(object):
            
             new_doe[el1, col] = self.doe[el2, col]
             new_doe[el2, col] = self.doe[el1, col] 
+            rows.update([el1, el2])
                
-        return LHC_indivudal(new_doe, self.q, self.p)
+        return LHC_indivudal(new_doe, self.q, self.p, parent=self, 
+                             rows=array(sorted(rows), dtype=int))
     
     def __iter__(self):
         return self._get_rows()
@@ -202,6 +242,8 @@ class OptLatinHypercube(HasTraits):
         desc="Number of generations the optimization will evolve over.")
     norm_method = Enum(["1-norm","2-norm"],
                     desc="Vector norm calculation method. '1-norm' is faster, but less accurate.")
+    num_processes = Int(1,
+        desc="Number of worker processes that evaluate the population.")
     
     def __init__(self, num_samples=None, population=None,generations=None):
         super(OptLatinHypercube,self).__init__()
@@ -222,21 +264,47 @@ class OptLatinHypercube(HasTraits):
         rand_doe = rand_latin_hypercube(self.num_samples, self.num_parameters)
         best_lhc = LHC_indivudal(rand_doe, q=1, p=_norm_map[self.norm_method])
         
-        for q in self.qs:
-            lh = LHC_indivudal(rand_doe, q, _norm_map[self.norm_method])
-            lh_opt = _mmlhs(lh, self.population, self.generations)
-            if lh_opt.mmphi() < best_lhc.mmphi():
-                best_lhc = lh_opt
+        #one pool of worker processes for the optimizations of all qs
+        pool = Pool(self.num_processes) if self.num_processes > 1 else None
+        try:
+            for q in self.qs:
+                lh = LHC_indivudal(rand_doe, q, _norm_map[self.norm_method])
+                lh_opt = _mmlhs(lh, self.population, self.generations, 
+                                self.num_processes, pool)
+                if lh_opt.mmphi() < best_lhc.mmphi():
+                    best_lhc = lh_opt
+        finally:
+            if pool is not None:
+                pool.terminate()
 
         for row in best_lhc:
             yield row
             
 
 @stub_if_missing_deps('numpy')
-def _mmlhs(x_start, population, generations):
+def _mmlhs(x_start, population, generations, num_processes=1, pool=None):
     """Evolutionary search for most space filling Latin-Hypercube. 
     Returns a new LatinHypercube instance with an optimized set of points.
+    With more than one process the offspring of each generation are 
+    evaluated by the num_processes workers of pool. If no pool is given,
+    one is started for this search only.
     """
+    if num_processes <= 1:
+        return _mmlhs_generations(x_start, population, generations, 1, None)
+    if pool is not None:
+        return _mmlhs_generations(x_start, population, generations, 
+                                  num_processes, pool)
+    
+    pool = Pool(num_processes)
+    try:
+        return _mmlhs_generations(x_start, population, generations, 
+                                  num_processes, pool)
+    finally:
+        pool.terminate()
+
+
+def _mmlhs_generations(x_start, population, generations, num_processes, pool):
+    """Generations of the evolutionary search of _mmlhs."""
     x_best = x_start
     phi_best = x_start.mmphi()
     n = x_start.shape[1]
@@ -252,8 +320,17 @@ def _mmlhs(x_start, population, generations):
         x_improved = x_best
         phi_improved = phi_best
         
-        for offspring in range(population):
-            x_try = x_best.perturb(mutations)
+        offspring = [x_best.perturb(mutations) for i in range(population)]
+        if pool is not None:
+            #one batch per process, so the terms of the parent are sent once
+            terms = x_best.get_terms()
+            batches = [(terms, [(x.doe, x._rows) for x in offspring[i::num_processes]], 
+                        x_best.q, x_best.p) for i in range(num_processes)]
+            for i, phis in enumerate(pool.map(_offspring_phis, batches)):
+                for x_try, phi_try in zip(offspring[i::num_processes], phis):
+                    x_try.phi = phi_try
+        
+        for x_try in offspring:
             phi_try = x_try.mmphi()
             
             if phi_try < phi_improved: 
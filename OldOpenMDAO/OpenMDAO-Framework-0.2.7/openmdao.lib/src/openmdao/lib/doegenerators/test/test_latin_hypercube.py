@@ -6,7 +6,8 @@ import sys
 import unittest
 import random
 
-from numpy import array, zeros
+from numpy import array, zeros, array_equal
+from numpy.linalg import norm
 
 from openmdao.main.api import Assembly, Component, Case, set_as_top
 from openmdao.lib.doegenerators.optlh import LHC_indivudal, OptLatinHypercube, _mmlhs, \
@@ -24,6 +25,42 @@ class TestCase(unittest.TestCase):
         self.assertTrue(is_latin_hypercube(lh_opt))
         self.assertTrue(opt_phi < phi1)
         
+    def test_mmphi(self):
+        doe = rand_latin_hypercube(12,3)
+        for q,p in [(2,1),(5,2)]:
+            phi = sum([norm(doe[i]-doe[j],ord=p)**(-q) for i in range(12) 
+                       for j in range(i+1,12)])**(1.0/q)
+            self.assertAlmostEqual(phi, LHC_indivudal(doe,q,p).mmphi(), places=10)
+            
+    def test_perturb_mmphi(self):
+        lh = LHC_indivudal(rand_latin_hypercube(20,4), 2, 2)
+        lh.mmphi()
+        for i in range(5):
+            lh = lh.perturb(3)
+            # only the changed rows are recalculated
+            self.assertTrue(len(lh._rows) <= 6)
+            phi = LHC_indivudal(lh.doe.copy(), 2, 2).mmphi()
+            self.assertAlmostEqual(phi, lh.mmphi(), places=10)
+            self.assertTrue(is_latin_hypercube(lh))
+            
+    def test_mmlhs_processes(self):
+        random.seed(10)
+        lh = LHC_indivudal(rand_latin_hypercube(15,3), 2, 1) 
+        lh_opt = _mmlhs(lh, 10, 5)
+        random.seed(10)
+        lh = LHC_indivudal(rand_latin_hypercube(15,3), 2, 1) 
+        lh_opt2 = _mmlhs(lh, 10, 5, num_processes=2)
+        self.assertTrue(array_equal(lh_opt.doe, lh_opt2.doe))
+        self.assertAlmostEqual(lh_opt.mmphi(), lh_opt2.mmphi(), places=10)
+        
+    def test_mmlhs_one_param(self):
+        #a single design variable gives no mutations after the first generations
+        random.seed(10)
+        lh = LHC_indivudal(rand_latin_hypercube(10,1), 2, 1) 
+        lh_opt = _mmlhs(lh, 5, 10)
+        self.assertTrue(is_latin_hypercube(lh_opt))
+        self.assertTrue(lh_opt.mmphi() <= lh.mmphi())
+        
     def test_OptLatinHypercube(self):
         olh = OptLatinHypercube()
         olh.num_samples = 10
@@ -1,32 +1,43 @@
 """ Surrogate model based on Kriging. """
 
-from math import log, e, sqrt
 import logging
 
 # pylint: disable-msg=E0611,F0401
 try:
-    from numpy import array, zeros, dot, ones, arange, eye, abs, vstack, exp, diag
-    from numpy.linalg import det, linalg, lstsq
-    from scipy.linalg import cho_factor, cho_solve
-    from scipy.optimize import fmin
+    from numpy import array, zeros, dot, ones, abs, vstack, exp, sqrt, \
+                      newaxis, diag_indices, diag, eye, outer, clip, log, \
+                      linspace, arange, concatenate
+    from numpy.linalg import det, lstsq, LinAlgError
+    from scipy.linalg import cho_factor, cho_solve, solve_triangular
+    from scipy.optimize import fmin_l_bfgs_b
 except ImportError as err:
     logging.warn("In %s: %r" % (__file__, err))
 
 import zope.interface
 
-from openmdao.main.interfaces import implements, ISurrogate
+from openmdao.main.interfaces import implements, IIncrementalSurrogate
 from openmdao.main.uncertain_distributions import NormalDistribution
 from openmdao.util.decorators import stub_if_missing_deps
 
 @stub_if_missing_deps('numpy', 'scipy')
 class KrigingSurrogate(object): 
-    implements(ISurrogate)
+    implements(IIncrementalSurrogate)
     
-    def __init__(self,X=None,Y=None):
+    def __init__(self,X=None,Y=None,warm_start=False):
         self.m = None #number of independent
         self.n = None #number of training points
         self.thetas = None
         self.nugget = 0 #nugget smoothing parameter from [Sasena, 2002]
+        #bounds of the log10 of the thetas in the likelihood maximization
+        self.theta_bounds = (-3., 3.)
+        #start the fit from the thetas of the previous training, so a 
+        #retrain after a few new points (e.g. in a MetaModel) takes only 
+        #a few iterations 
+        self.warm_start = warm_start
+        #amount of points added with add_training_data after which the 
+        #model is trained again on all points (fitting the thetas again)
+        self.refit_interval = 20
+        self._n_added = 0
         
         self.R = None
         self.R_fact = None
@@ -49,55 +60,53 @@ class KrigingSurrogate(object):
         """Calculates a predicted value of the response based on the current
         trained model for the supplied list of inputs.
         """
+        f, RMSE = self.predict_batch([new_x])
+        return NormalDistribution(f[0], RMSE[0])
+        
+    def predict_batch(self,X_new):
+        """Calculates the predicted values of the response and their root
+        mean squared errors for a set of points at once. All points are
+        solved against the factorized correlation matrix together, with one
+        column per point.
+        
+        X_new: 2D array-like
+            One row of inputs per point.
+            
+        Returns the arrays (f, RMSE) with one value per point.
+        """
         if self.m == None: #untrained surrogate
             raise RuntimeError("KrigingSurrogate has not been trained, so no "
                                "prediction can be made")
-        r = zeros(self.n)
-        X, Y = self.X, self.Y
-        thetas = 10.**self.thetas
-        XX = array(X)
-        new_x = array(new_x)
-        for i in range(self.n):
-            r[i] = sum(thetas*(XX[i]-new_x)**2.)
-        r = exp(-r)
-            
-        one = ones(self.n)
-        if self.R_fact is not None: 
-            #---CHOLESKY DECOMPOSTION ---
-            #f = self.mu+dot(r,cho_solve(self.R_fact,Y-dot(one,self.mu)))
-            #term1 = dot(r,cho_solve(self.R_fact,r))
-            #term2 = (1.0-dot(one,cho_solve(self.R_fact,r)))**2./dot(one,cho_solve(self.R_fact,one))
-            
-            rhs = vstack([(Y-dot(one, self.mu)), r, one]).T
-            R_fact = (self.R_fact[0].T,not self.R_fact[1])
-            cho = cho_solve(R_fact, rhs).T
-            
-            f = self.mu + dot(r, cho[0])
-            term1 = dot(r, cho[1])
-            term2 = (1.0 - dot(one, cho[1]))**2./dot(one, cho[2])
-            
-        else: 
-            #-----LSTSQ-------
-            rhs = vstack([(Y-dot(one, self.mu)), r, one]).T
-            lsq = lstsq(self.R.T, rhs)[0].T
-            
-            f = self.mu + dot(r, lsq[0])
-            term1 = dot(r, lsq[1])
-            term2 = (1.0 - dot(one, lsq[1]))**2./dot(one, lsq[2])
-            """
-      #-----LSTSQ-------
-      rhs = vstack([(Y-dot(one, self.mu)), r, one]).T
-      lsq = lstsq(self.R.T, rhs)[0].T
-      
-      f = self.mu + dot(r, lsq[0])
-      term1 = dot(r, lsq[1])
-      term2 = (1.0 - dot(one, lsq[1]))**2./dot(one, lsq[2])
-      """
+        X_new = array(X_new, dtype=float).reshape(-1, self.m)
+        r = self._correlation(X_new, array(self.X, dtype=float))
+        
+        #R^-1*r' for all points, one column each
+        Rinv_r = self._solve(r.T)
+        f = self.mu + dot(r, self._alpha)
+        term1 = (r*Rinv_r.T).sum(axis=1)
+        term2 = (1.0 - Rinv_r.sum(axis=0))**2./self._one_Rinv_one
+        
         MSE = self.sig2*(1.0-term1+term2)
         RMSE = sqrt(abs(MSE))
         
-        return NormalDistribution(f, RMSE)
+        return f, RMSE
         
+    def _correlation(self,X1,X2):
+        """Gaussian correlation between the rows of X1 and the rows of X2,
+        built one input dimension at a time with broadcasting."""
+        thetas = 10.**self.thetas
+        dist = zeros((len(X1), len(X2)))
+        for k in range(self.m):
+            dist += thetas[k]*(X1[:, k, newaxis]-X2[newaxis, :, k])**2.
+        return exp(-dist)
+        
+    def _solve(self,rhs):
+        """Solves R*x = rhs (rhs can have multiple columns), with the
+        cholesky factorization or with least squares if R could not be
+        factorized."""
+        if self.R_fact is not None: 
+            return cho_solve(self.R_fact, rhs)
+        return lstsq(self.R, rhs)[0]
 
     def train(self,X,Y):
         """Train the surrogate model with the given set of inputs and outputs."""
@@ -113,45 +122,141 @@ class KrigingSurrogate(object):
         self.Y = Y
         self.m = len(X[0])
         self.n = len(X)
+        self._n_added = 0
                 
-        thetas = zeros(self.m)
         def _calcll(thetas):
             self.thetas = thetas
             self._calculate_log_likelihood()
             return -self.log_likelihood
-        #if self.thetas == None:
-        self.thetas = fmin(_calcll, thetas, disp=False, ftol = 0.0001)
+        def _calcll_grad(thetas):
+            return _calcll(thetas), -self._log_likelihood_gradient()
+        
+        thetas = None
+        low, high = self.theta_bounds
+        if self.warm_start and self.thetas is not None and len(self.thetas) == self.m \
+           and all((self.thetas > low) & (self.thetas < high)):
+            #the optimum is often close to where R becomes singular, so 
+            #the new points can make it singular at the previous thetas, 
+            #larger thetas give a better conditioned R
+            previous = self.thetas
+            for shift in arange(0., 1.01, 0.1):
+                thetas = clip(previous+shift, low, high)
+                _calcll(thetas)
+                if self.R_fact is not None: 
+                    break
+            else: #still singular for the new data, start over
+                thetas = None
+        if thetas is None: 
+            #start at the best equal thetas of a coarse grid, the likelihood 
+            #is flat for large thetas and a fit started far from the optimum 
+            #can stop there
+            grid = linspace(low, high, 13)
+            start = min(grid, key=lambda t: _calcll(t*ones(self.m)))
+            thetas = start*ones(self.m)
+        self.thetas = fmin_l_bfgs_b(_calcll_grad, thetas, 
+                                    bounds=[self.theta_bounds]*self.m)[0]
         self._calculate_log_likelihood()
         
     def _calculate_log_likelihood(self):
         #if self.m == None:
         #    Give error message
-        R = zeros((self.n, self.n))
-        X,Y = array(self.X), array(self.Y)
-        thetas = 10.**self.thetas
-        for i in range(self.n):
-            for j in arange(i+1,self.n):
-                R[i,j] = (1-self.nugget)*e**(-sum(thetas*(X[i]-X[j])**2.)) #weighted distance formula
-        R = R + R.T + eye(self.n)
+        X,Y = array(self.X, dtype=float), array(self.Y, dtype=float)
+        R = (1-self.nugget)*self._correlation(X, X) #weighted distance formula
+        R[diag_indices(self.n)] = 1.
         self.R = R
-        one = ones(self.n)
         try:
             self.R_fact = cho_factor(R)
-            rhs = vstack([Y, one]).T
-            R_fact = (self.R_fact[0].T,not self.R_fact[1])
-            cho = cho_solve(R_fact, rhs).T
-            
-            self.mu = dot(one,cho[0])/dot(one,cho[1])
-            self.sig2 = dot(Y-dot(one,self.mu),cho_solve(self.R_fact,(Y-dot(one,self.mu))))/self.n
-            #self.log_likelihood = -self.n/2.*log(self.sig2)-1./2.*log(abs(det(self.R)+1.e-16))-sum(thetas)
-            self.log_likelihood = -self.n/2.*log(self.sig2)-1./2.*log(abs(det(self.R)+1.e-16))
-        except (linalg.LinAlgError,ValueError):
+        except (LinAlgError,ValueError):
             #------LSTSQ---------
             self.R_fact = None #reset this to none, so we know not to use cholesky
             #self.R = self.R+diag([10e-6]*self.n) #improve conditioning[Booker et al., 1999]
-            rhs = vstack([Y, one]).T
-            lsq = lstsq(self.R.T,rhs)[0].T
-            self.mu = dot(one,lsq[0])/dot(one,lsq[1])
-            self.sig2 = dot(Y-dot(one,self.mu),lstsq(self.R,Y-dot(one,self.mu))[0])/self.n
-            self.log_likelihood = -self.n/2.*log(self.sig2)-1./2.*log(abs(det(self.R)+1.e-16))
-            #print self.log_likelihood
\ No newline at end of file
+        self._calculate_estimates()
+        
+    def _calculate_estimates(self):
+        """mu, sig2 and the log likelihood for the current R and R_fact"""
+        Y = array(self.Y, dtype=float)
+        one = ones(self.n)
+        rhs = vstack([Y, one]).T
+        sol = self._solve(rhs).T
+        
+        self.mu = dot(one,sol[0])/dot(one,sol[1])
+        #R^-1*(Y-mu) and R^-1*one are kept for the predictions
+        self._alpha = sol[0]-self.mu*sol[1]
+        self._Rinv_one = sol[1]
+        self._one_Rinv_one = dot(one,sol[1])
+        self.sig2 = dot(Y-dot(one,self.mu),self._alpha)/self.n
+        if self.R_fact is not None: 
+            #log(det(R)) from the diagonal of the cholesky factor
+            log_det = 2.*log(diag(self.R_fact[0])).sum()
+        else: 
+            log_det = log(abs(det(self.R)+1.e-16))
+        self.log_likelihood = -self.n/2.*log(self.sig2)-1./2.*log_det
+        
+    def add_training_data(self,X,Y):
+        """Adds training points to the trained model, keeping the thetas. 
+        The cholesky factor of R is extended by a row for every new point, 
+        which costs O(n^2) per point instead of the O(n^3) factorization. 
+        After refit_interval added points, or when R can not be extended, 
+        the model is trained again on all points."""
+        if self.m == None: #untrained surrogate
+            self.train(X,Y)
+            return
+        X_new = array(X, dtype=float).reshape(-1, self.m)
+        X_all = vstack([array(self.X, dtype=float), X_new])
+        Y_all = concatenate([array(self.Y, dtype=float), array(Y, dtype=float)])
+        self._n_added += len(X_new)
+        if self._n_added >= self.refit_interval or self.R_fact is None: 
+            self.train(X_all, Y_all)
+            return
+        
+        c, lower = self.R_fact
+        R = self.R
+        for x in X_new: 
+            n = len(R)
+            r = (1-self.nugget)*self._correlation(x[newaxis], X_all[:n])[0]
+            #new row of the factor u = L^-1*r and diagonal term sqrt(1-u*u')
+            if lower: 
+                u = solve_triangular(c, r, lower=True)
+            else: 
+                u = solve_triangular(c, r, trans='T')
+            d2 = 1.-dot(u, u)
+            if d2 <= 0.: #not positive definite, as cho_factor would fail
+                self.train(X_all, Y_all)
+                return
+            c_new, R_new = zeros((n+1, n+1)), ones((n+1, n+1))
+            c_new[:n, :n], R_new[:n, :n] = c, R
+            if lower: 
+                c_new[n, :n] = u
+            else: 
+                c_new[:n, n] = u
+            c_new[n, n] = sqrt(d2)
+            R_new[:n, n] = R_new[n, :n] = r
+            c, R = c_new, R_new
+        
+        self.X, self.Y, self.n = X_all, Y_all, len(X_all)
+        self.R, self.R_fact = R, (c, lower)
+        self._calculate_estimates()
+        
+    def _log_likelihood_gradient(self):
+        """Derivatives of the log likelihood to the log10 of the thetas, 
+        for the R, mu and sig2 of the last likelihood calculation. 
+        dL/dR = 1/2*(alpha*alpha'/sig2 - R^-1), with alpha = R^-1*(Y-mu). 
+        mu and sig2 maximize the likelihood, so their changes drop out."""
+        X = array(self.X, dtype=float)
+        dLdR = outer(self._alpha, self._alpha)/self.sig2
+        if self.R_fact is not None: 
+            dLdR -= cho_solve(self.R_fact, eye(self.n))
+        else: 
+            #derivative of the log(abs(det(R)+1e-16)) of _calculate_estimates,
+            #with the least squares inverse of the (nearly) singular R
+            det_R = det(self.R)
+            dLdR -= det_R/(det_R+1e-16)*lstsq(self.R, eye(self.n))[0]
+        dLdR *= 0.5
+        
+        thetas = 10.**self.thetas
+        grad = zeros(self.m)
+        for k in range(self.m):
+            #dR/dlog10(theta_k) = -ln(10)*theta_k*(x_ik-x_jk)^2*R_ij
+            dist = (X[:, k, newaxis]-X[newaxis, :, k])**2.
+            grad[k] = -log(10.)*thetas[k]*(dLdR*dist*self.R).sum()
+        return grad
@@ -1,14 +1,15 @@
 """Surrogate Model based on second order response surface equations."""
 
-from numpy import matrix, linalg, power, multiply, concatenate, ones
+from numpy import linalg, multiply, concatenate, empty, array, vstack, \
+                  dot, outer
 
 from enthought.traits.api import HasTraits
 
-from openmdao.main.interfaces import implements,ISurrogate
+from openmdao.main.interfaces import implements,IIncrementalSurrogate
 from openmdao.lib.datatypes.api import Float, Bool
 
 class ResponseSurface(HasTraits): 
-    implements(ISurrogate) 
+    implements(IIncrementalSurrogate) 
     
     def __init__(self,X=None,Y=None): 
         # must call HasTraits init to set up Traits stuff 
@@ -17,6 +18,11 @@ class ResponseSurface(HasTraits):
         self.m = None #number of training points 
         self.n = None #number of independents
         self.betas = None #vector of response surface equation coefficients
+        #amount of points added with add_training_data after which the 
+        #coefficients are calculated again from all points, which removes 
+        #the round-off errors of the recursive updates
+        self.refit_interval = 100
+        self._n_added = 0
         
         if X is not None and Y is not None: 
             self.train(X,Y)
@@ -28,39 +34,88 @@ class ResponseSurface(HasTraits):
     def train(self,X,Y): 
         """ Calculate response surface equation coefficients using least squares regression. """ 
         
-        X = matrix(X)
-        Y = matrix(Y).T
+        self._X_train = array(X, dtype=float)
+        self._Y_train = array(Y, dtype=float)
+        self._n_added = 0
         
-        self.m = X.shape[0]
-        self.n = X.shape[1]
+        self.m = self._X_train.shape[0]
+        self.n = self._X_train.shape[1]
         
         # Modify X to include constant, squared terms and cross terms
-        X = concatenate((matrix(ones((self.m,1))),X),1) 
-        for i in range(1,self.n+1):
-            X = concatenate((X,power(X[:,i],2)),1)
-        for i in range(1,self.n):
-            for j in range(i+1,self.n+1):
-                X = concatenate((X,multiply(X[:,i],X[:,j])),1)
+        X = self._expand(self._X_train)
         
         # Determine response surface equation coefficients (betas) using least squares
-        self.betas, rs, r, s = linalg.lstsq(X,Y)
+        self.betas, rs, r, s = linalg.lstsq(X,self._Y_train)
+        
+        # inverse of X'X for the recursive least squares updates, only 
+        # when the coefficients are fully determined by the training data
+        self._XtX_inv = linalg.inv(dot(X.T,X)) if r == X.shape[1] else None
+        
+    def add_training_data(self,X,Y): 
+        """Adds training points to the trained response surface with recursive 
+        least squares, which updates the coefficients and the inverse of X'X 
+        per point without solving the least squares problem again. After 
+        refit_interval added points, or when the coefficients were not 
+        fully determined, the coefficients are calculated from all points."""
+        if self.betas is None: 
+            self.train(X,Y)
+            return
+        X_all = vstack([self._X_train, array(X, dtype=float).reshape(-1, self.n)])
+        Y_all = concatenate([self._Y_train, array(Y, dtype=float)])
+        self._n_added += len(X_all)-self.m
+        if self._n_added >= self.refit_interval or self._XtX_inv is None: 
+            self.train(X_all, Y_all)
+            return
+        
+        P = self._XtX_inv
+        betas = self.betas.copy()
+        for x, y in zip(self._expand(X_all[self.m:]), Y_all[self.m:]): 
+            Px = dot(P, x)
+            gain = Px/(1.+dot(x, Px))
+            betas += gain*(y-dot(x, betas))
+            P -= outer(gain, Px)
+        
+        self._XtX_inv = P
+        self.betas = betas
+        self._X_train, self._Y_train = X_all, Y_all
+        self.m = len(X_all)
+        
+    def _expand(self,X): 
+        """Returns the design matrix of the inputs X (array with one point 
+        per row): a constant, the inputs, the squared and the cross terms. 
+        The columns are written into one preallocated array, the cross 
+        terms of input i with the inputs after it in one block."""
+        m, n = X.shape
+        D = empty((m, 1+2*n+n*(n-1)//2))
+        D[:,0] = 1.
+        D[:,1:n+1] = X
+        multiply(X, X, out=D[:,n+1:2*n+1])
+        k = 2*n+1
+        for i in range(n-1):
+            multiply(X[:,i:i+1], X[:,i+1:], out=D[:,k:k+n-1-i])
+            k += n-1-i
+        return D
         
     def predict(self,new_x): 
         """Calculates a predicted value of the response based on the current response surface model for the supplied list of inputs. """ 
         
-        new_x = matrix(new_x)
+        return self.predict_batch([new_x])[0]
+        
+    def predict_batch(self,X_new): 
+        """Calculates the predicted values of the response for a set of 
+        points at once.
+        
+        X_new: 2D array-like
+            One row of inputs per point.
+            
+        Returns an array with one value per point.
+        """
         
-        # Modify new_x to include constant, squared terms and cross terms
-        new_x = concatenate((matrix(ones((1,1))),new_x),1) 
-        for i in range(1,self.n+1):
-            new_x = concatenate((new_x,power(new_x[:,i],2)),1)
-        for i in range(1,self.n):
-            for j in range(i+1,self.n+1):
-                new_x = concatenate((new_x,multiply(new_x[:,i],new_x[:,j])),1)
+        # Modify X_new to include constant, squared terms and cross terms
+        X_new = self._expand(array(X_new, dtype=float).reshape(-1, self.n))
         
         # Predict new_y using new_x and betas
-        new_y = new_x*self.betas
-        return new_y[0,0]
+        return dot(X_new, self.betas)
 
 
 if __name__ == "__main__":
@@ -5,6 +5,7 @@ import random
 
 from numpy import array,round,linspace,sin,cos,pi
 import numpy.random as numpy_random
+from numpy.linalg import LinAlgError
 
 from openmdao.lib.surrogatemodels.kriging_surrogate import KrigingSurrogate
 from openmdao.lib.casehandlers.api import ListCaseIterator
@@ -29,7 +30,57 @@ class KrigingSurrogateTests(unittest.TestCase):
         krig1 = KrigingSurrogate()
         krig1.train(x,y)
 
-        self.assertAlmostEqual(1.18375,krig1.thetas,places=7)
+        self.assertAlmostEqual(1.183723,krig1.thetas,places=5)
+        
+    def test_warm_start(self):
+        x = array([[0.05], [.25], [0.61], [0.95]])
+        y = array([0.738513784857542,-0.210367746201974,-0.489015457891476,12.3033138316612])
+        krig1 = KrigingSurrogate(warm_start=True)
+        krig1.train(x[:3],y[:3])
+        krig1.train(x,y)
+        
+        self.assertAlmostEqual(1.183723,krig1.thetas,places=5)
+        
+        #retraining on the same data starts at the optimum
+        calls = []
+        calculate = krig1._calculate_log_likelihood
+        def _count(): 
+            calls.append(1)
+            calculate()
+        krig1._calculate_log_likelihood = _count
+        krig1.train(x,y)
+        
+        self.assertTrue(len(calls) < 5)
+        self.assertAlmostEqual(1.183723,krig1.thetas,places=5)
+        
+    def test_log_likelihood_gradient(self):
+        x = array([[0.05], [.25], [0.61], [0.95]])
+        y = array([0.738513784857542,-0.210367746201974,-0.489015457891476,12.3033138316612])
+        krig1 = KrigingSurrogate(x,y)
+        
+        def _check():
+            krig1.thetas = array([0.5])
+            krig1._calculate_log_likelihood()
+            grad = krig1._log_likelihood_gradient()
+            likelihoods = []
+            for step in (1e-6, -1e-6):
+                krig1.thetas = array([0.5+step])
+                krig1._calculate_log_likelihood()
+                likelihoods.append(krig1.log_likelihood)
+            self.assertAlmostEqual(grad[0], (likelihoods[0]-likelihoods[1])/2e-6, places=4)
+        _check()
+        
+        #without a Cholesky factorization R is solved by least squares
+        import openmdao.lib.surrogatemodels.kriging_surrogate as kriging
+        cho_factor = kriging.cho_factor
+        def _fail(*args, **kwargs): 
+            raise LinAlgError()
+        kriging.cho_factor = _fail
+        try: 
+            _check()
+            self.assertTrue(krig1.R_fact is None)
+        finally: 
+            kriging.cho_factor = cho_factor
         
     def test_1d_kriging_predictor(self):
         x = array([[0.05], [.25], [0.61], [0.95]])
@@ -72,6 +123,49 @@ class KrigingSurrogateTests(unittest.TestCase):
         self.assertAlmostEqual(14.513550,pred.sigma,places=2)
         self.assertAlmostEqual(18.759264,pred.mu,places=2)
         
+    def test_predict_batch(self):
+        x = array([[0.05], [.25], [0.61], [0.95]])
+        y = array([0.738513784857542,-0.210367746201974,-0.489015457891476,12.3033138316612])
+        krig1 = KrigingSurrogate(x,y)
+        new_x = array([[0.5], [0.05], [0.8]])
+        f, RMSE = krig1.predict_batch(new_x)
+        
+        self.assertEqual(f.shape, (3,))
+        self.assertAlmostEqual(2.5086,RMSE[0],places=3)
+        self.assertAlmostEqual(-1.37201,f[0],places=3)
+        self.assertAlmostEqual(y[0],f[1],places=7)
+        for i in range(3):
+            pred = krig1.predict(new_x[i])
+            self.assertAlmostEqual(pred.mu,f[i],places=10)
+            self.assertAlmostEqual(pred.sigma,RMSE[i],places=10)
+        
+    def test_add_training_data(self):
+        x = array([[0.05], [.25], [0.61], [0.95]])
+        y = array([0.738513784857542,-0.210367746201974,-0.489015457891476,12.3033138316612])
+        krig1 = KrigingSurrogate(x[:2],y[:2])
+        krig1.add_training_data(x[2:],y[2:])
+        
+        # same model as training with the thetas of the first training
+        krig2 = KrigingSurrogate()
+        krig2.X, krig2.Y, krig2.m, krig2.n = x, y, 1, 4
+        krig2.thetas = krig1.thetas
+        krig2._calculate_log_likelihood()
+        
+        self.assertEqual(krig1.n, 4)
+        self.assertAlmostEqual(krig2.mu,krig1.mu,places=10)
+        self.assertAlmostEqual(krig2.sig2,krig1.sig2,places=10)
+        self.assertAlmostEqual(krig2.log_likelihood,krig1.log_likelihood,places=10)
+        pred1 = krig1.predict([0.5])
+        pred2 = krig2.predict([0.5])
+        self.assertAlmostEqual(pred2.mu,pred1.mu,places=10)
+        self.assertAlmostEqual(pred2.sigma,pred1.sigma,places=10)
+        
+        # after refit_interval added points the thetas are fitted again
+        krig1.refit_interval = 2
+        krig1.add_training_data([[0.4]],[0.1])
+        self.assertEqual(krig1._n_added, 0)
+        self.assertEqual(krig1.n, 5)
+        
     def test_get_uncertain_value(self): 
         x = array([[0.05], [.25], [0.61], [0.95]])
         y = array([0.738513784857542,-0.210367746201974,-0.489015457891476,12.3033138316612])
@@ -5,6 +5,7 @@ from numpy import array,round,linspace,sin,cos,pi
 import numpy as np
 
 from openmdao.lib.surrogatemodels.logistic_regression import LogisticRegression
+from openmdao.lib.surrogatemodels.response_surface import ResponseSurface
 
 
 class LogisticRegressionTest(unittest.TestCase):
@@ -42,4 +43,45 @@ class LogisticRegressionTest(unittest.TestCase):
     def test_uncertain_value(self): 
         lr = LogisticRegression()
         
-        self.assertEqual(lr.get_uncertain_value(1.0),1.0)
\ No newline at end of file
+        self.assertEqual(lr.get_uncertain_value(1.0),1.0)
+        
+        
+class ResponseSurfaceTest(unittest.TestCase):
+    
+    def setUp(self):
+        np.random.seed(10)
+        self.X = np.random.random((60, 3))
+        self.Y = 1.+np.dot(self.X,[1.,2.,3.])+self.X[:,0]*self.X[:,1]-self.X[:,2]**2+ \
+                 0.01*np.random.randn(60)
+        
+    def test_predict_batch(self):
+        rs = ResponseSurface(self.X,self.Y)
+        
+        # constant, 3 inputs, 3 squares and 3 cross terms 
+        self.assertEqual(len(rs.betas), 10)
+        pred = rs.predict_batch(self.X[:10])
+        self.assertEqual(pred.shape, (10,))
+        for i in range(10): 
+            self.assertAlmostEqual(rs.predict(self.X[i]),pred[i],places=12)
+            self.assertAlmostEqual(self.Y[i],pred[i],places=1)
+        
+    def test_add_training_data(self):
+        rs = ResponseSurface(self.X[:20],self.Y[:20])
+        for i in range(20,40): 
+            rs.add_training_data(self.X[i:i+1],self.Y[i:i+1])
+        rs.add_training_data(self.X[40:],self.Y[40:])
+        full = ResponseSurface(self.X,self.Y)
+        
+        self.assertEqual(rs.m, 60)
+        for beta,beta_full in zip(np.asarray(rs.betas).flatten(),np.asarray(full.betas).flatten()): 
+            self.assertAlmostEqual(beta_full,beta,places=8)
+        self.assertAlmostEqual(full.predict([0.5,0.5,0.5]),rs.predict([0.5,0.5,0.5]),places=8)
+        
+    def test_refit(self):
+        # not enough points to determine all coefficients
+        rs = ResponseSurface(self.X[:5],self.Y[:5])
+        self.assertTrue(rs._XtX_inv is None)
+        rs.refit_interval = 10
+        rs.add_training_data(self.X[5:20],self.Y[5:20])
+        self.assertEqual(rs._n_added, 0)
+        self.assertTrue(rs._XtX_inv is not None)
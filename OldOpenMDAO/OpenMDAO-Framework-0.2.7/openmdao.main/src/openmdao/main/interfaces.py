@@ -519,6 +519,19 @@ class ISurrogate(Interface):
             Training case output history for this surrogate's output,
             which corresponds to the training case input history given by X.
         """
+        
+class IIncrementalSurrogate(ISurrogate):
+    
+    def add_training_data(X, Y): 
+        """Adds training cases to a surrogate model that was already trained,
+        updating the model instead of training it again on the full history.
+        
+        X: iterator of lists
+            Values representing the new training case inputs.
+        Y: iterator
+            Output values of the new training cases, which correspond to 
+            the inputs given by X.
+        """
     
 class IHasParameters(Interface):
     
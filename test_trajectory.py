@@ -0,0 +1,57 @@
+import unittest
+import numpy as np
+from openmdao.api import Problem
+from openmdao.utils.assert_utils import assert_check_partials
+from trajectory import TrajectoryMarchComp
+
+
+def march(complex_step=False, **options):
+    p = Problem()
+    p.model.add_subsystem('march', TrajectoryMarchComp(**options), promotes=['*'])
+    p.setup(force_alloc_complex=complex_step)
+    p['T'] = 0.015
+    p['M_0'] = 150.
+    p['R_0'] = 6778000.
+    p.run_model()
+    return p
+
+
+class TrajectoryMarchTest(unittest.TestCase):
+    def test_constant_thrust(self):
+        p = march(n=365, d_t=24*3600.)
+        t = np.arange(366)*24*3600.
+        mu, v_e = 398600.4418*10**9, 9810.
+        #Constant thrust: linear mass flow, rocket equation DeltaV and Edelbaum velocity change
+        M = 150.-0.015*t/v_e
+        r = mu/(np.sqrt(mu/6778000.)-v_e*np.log(150./M))**2
+        np.testing.assert_allclose(p['M'], M, rtol=1e-13)
+        np.testing.assert_allclose(p['r'], r, rtol=1e-12)
+
+        #Same radius from the ODE dr/dt = 2*T/M*sqrt(r**3/mu)
+        from scipy.integrate import solve_ivp
+        ode = solve_ivp(lambda t, r: 2*0.015/(150.-0.015*t/v_e)*np.sqrt(r**3/mu), (0., t[-1]), [6778000.], t_eval=t, rtol=1e-12, atol=1e-6)
+        np.testing.assert_allclose(p['r'], ode.y[0], rtol=1e-9)
+
+    def test_throttle(self):
+        #Half the steps without thrust deliver the same DeltaV as thrusting half of the time
+        p = march(n=10, d_t=3600., throttle=[1., 0.]*5)
+        full = march(n=5, d_t=3600.)
+        np.testing.assert_allclose(p['r'][::2], full['r'], rtol=1e-13)
+        np.testing.assert_allclose(p['r'][1::2], full['r'][1:], rtol=1e-13)
+
+    def test_partials(self):
+        p = march(complex_step=True, times=[0., 600., 3600., 7200., 36000.], throttle=[1., 0.5, 0., 1.])
+        data = p.check_partials(out_stream=None, method='cs')
+        assert_check_partials(data, atol=1e-8, rtol=1e-10)
+
+    def test_shapes(self):
+        with self.assertRaises(ValueError):
+            march(n=10, throttle=[1.])
+        with self.assertRaises(ValueError):
+            march(n=10, throttle=np.ones(11))
+        with self.assertRaises(ValueError):
+            march(times=[0., 3600., 3600.])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,5 @@
-from openmdao.api import ExplicitComponent, Problem, IndepVarComp, Group, view_model
-from mass_velocity_iter import MassIterComp
+from openmdao.api import ExplicitComponent, Problem, IndepVarComp, Group
+from mass_velocity_iter import MassVelocityComp
 from propellant_mass import MassPComp
 from battery import BatteryComp
 from solar_array import SolComp
@@ -39,19 +39,11 @@ N = 1 #Number of iteration steps
 model.add_subsystem('propul', MassPComp())
 model.add_subsystem('solar', SolComp())
 model.add_subsystem('battery', BatteryComp())
-massvel = model.add_subsystem('massvel', Group())
-
-for i in range(N):
-    name = f"istep_{i}"
-    massvel.add_subsystem(name, MassIterComp(), promotes=['T_0','v_e','T_th'])
-#Connecting variables
-for i in range(N-1):
-    massvel.connect(f"istep_{i}.M_e",f"istep_{i+1}.M_i")
-    massvel.connect(f"istep_{i}.DV_tot_e",f"istep_{i+1}.DV_tot_i")
-    massvel.connect(f"istep_{i}.step_e",f"istep_{i+1}.step_i")
-model.connect('M_0','massvel.istep_0.M_i')
-model.connect('step_0','massvel.istep_0.step_i')
-model.connect('DV_tot_0','massvel.istep_0.DV_tot_i')
+#All N steps in one array valued component
+massvel = model.add_subsystem('massvel', MassVelocityComp(n=N))
+model.connect('M_0','massvel.M_i')
+model.connect('step_0','massvel.step_i')
+model.connect('DV_tot_0','massvel.DV_tot_i')
 
 model.connect('M_0','propul.M_0')
 model.connect('R_0','propul.R_0')
@@ -86,14 +78,15 @@ model.connect('battery.T_th','massvel.T_th')
 #Set-up and Run
 p.setup()
 p.run_model()
-print(p[f'massvel.istep_{N-1}.DV_tot_e'])
+print(p['massvel.DV_tot_e'][-1])
 print(p['propul.DV_tot'])
-view_model(p)
 
 #Plotting
-Re = [(p['init_cond.R_0']-6378000)*10**-3,]
-for i in range(N):
-    Re.append((p[f'istep_{i}.Re']-6378000)*10**-3)
-time = np.arange(N+1)*timestep
-plt.plot(time,Re)
+import numpy as np
+import matplotlib.pyplot as plt
+DV = np.concatenate([p['DV_tot_0'], p['massvel.DV_tot_e']])
+time = np.arange(N+1)*p['battery.T_th'][0]/3600
+plt.plot(time,DV)
+plt.xlabel('Thrust Time [h]')
+plt.ylabel('Total Velocity [m/s]')
 plt.show()
@@ -1,5 +1,5 @@
 from openmdao.api import ExplicitComponent, Problem, IndepVarComp, Group
-from math import sqrt
+from math import sqrt, exp
 import numpy as np
 
 class MassIterComp(ExplicitComponent):
@@ -26,6 +26,70 @@ class MassIterComp(ExplicitComponent):
         outputs['M_e'] = np.exp(-DVi/inputs['v_e'])*inputs['M_i']
         outputs['step_e'] = inputs['step_i'] + 1
 
+class MassVelocityComp(ExplicitComponent):
+    """Computes Mass, Total Velocity and step number at the end of n thrust steps at once, replaces n chained MassIterComp's.
+
+    Every step gives DVi = T_0*T_th/M_i and M_e = M_i*exp(-DVi/v_e). With u = T_0*T_th/(v_e*M_i), the mass fraction spent in a step,
+    a step maps u to u*exp(u). Only this scalar recursion is stepped through, all outputs and their (analytic) partials follow from
+    the u's with array operations, the Total Velocity from the rocket equation DV_tot_e = DV_tot_i+v_e*log(M_i/M_e)."""
+    def initialize(self):
+        self.options.declare('n', default=111, types=int, desc='Number of steps')
+
+    def setup(self):
+        n = self.options['n']
+        #input (of the first step)
+        self.add_input('step_i', units=None, desc='Step number before the first step')
+        self.add_input('T_0',units='N',desc='Constant Thrust Value')
+        self.add_input('M_i',units='kg',desc='Satellite Mass at beginning of first step')
+        self.add_input('T_th', units='s', desc='Thrust Phase Duration')
+        self.add_input('v_e', units='m/s', desc='Exhaust Velocity')
+        self.add_input('DV_tot_i', units='m/s', desc='Total Velocity at the beginning of first step')
+        #outputs (of every step)
+        self.add_output('M_e', shape=n, units='kg', desc='Satellite Mass at end of each step')
+        self.add_output('step_e', shape=n, units=None, desc='Step number of each step')
+        self.add_output('DV_tot_e', shape=n, units='m/s', desc='Total Velocity at the end of each step')
+
+        rows, cols = np.arange(n), np.zeros(n, dtype=int)
+        self.declare_partials('M_e', ['T_0','M_i','T_th','v_e'], rows=rows, cols=cols)
+        self.declare_partials('DV_tot_e', ['T_0','M_i','T_th','v_e'], rows=rows, cols=cols)
+        self.declare_partials('DV_tot_e', 'DV_tot_i', rows=rows, cols=cols, val=1.)
+        self.declare_partials('step_e', 'step_i', rows=rows, cols=cols, val=1.)
+
+    def _fractions(self, inputs):
+        """Mass fraction u of every step (n+1 values, the last one after the last step) and their derivative to the first one"""
+        n = self.options['n']
+        c = inputs['T_0'][0]*inputs['T_th'][0]/inputs['v_e'][0]
+        u = [c/inputs['M_i'][0]]
+        for k in range(n):
+            u.append(u[-1]*exp(u[-1]))
+        u = np.array(u)
+        #du_k/du_0, every step multiplies the derivative with d(u*exp(u))/du
+        s = np.concatenate([[1.], np.cumprod(np.exp(u[:-1])*(1+u[:-1]))])
+        return c, u, s
+
+    def compute(self, inputs, outputs):
+        c, u, s = self._fractions(inputs)
+        M_e = c/u[1:]
+        outputs['M_e'] = M_e
+        outputs['DV_tot_e'] = inputs['DV_tot_i']+inputs['v_e']*np.log(inputs['M_i']/M_e)
+        outputs['step_e'] = inputs['step_i']+np.arange(1, self.options['n']+1)
+
+    def compute_partials(self, inputs, partials):
+        T_0, M_i, T_th, v_e = (inputs[name][0] for name in ['T_0','M_i','T_th','v_e'])
+        c, u, s = self._fractions(inputs)
+        u_e, s_e = u[1:], s[1:]
+        M_e = c/u_e
+        #M_e = c/u_e with u_0 = c/M_i
+        dM_dc = (1-s_e*u[0]/u_e)/u_e
+        dM_dM = c*s_e*u[0]/(u_e**2*M_i)
+        dM = {'T_0': dM_dc*T_th/v_e, 'T_th': dM_dc*T_0/v_e, 'v_e': -dM_dc*c/v_e, 'M_i': dM_dM}
+        for name, value in dM.items():
+            partials['M_e', name] = value
+            partials['DV_tot_e', name] = -v_e*value/M_e
+        partials['DV_tot_e', 'M_i'] += v_e/M_i
+        partials['DV_tot_e', 'v_e'] += np.log(M_i/M_e)
+
+
 if __name__ == "__main__":
     #Instance of IndepVarComp
     ivc = IndepVarComp()
@@ -42,41 +106,13 @@ if __name__ == "__main__":
     model.add_subsystem('init_cond', ivc, promotes=['*'])
     N = 111 #Number of iteration steps
 
-    for i in range(N):
-        name = f"istep_{i}"
-        model.add_subsystem(name, MassIterComp())
-
-    #Connecting variables
-    for i in range(N-1):
-        model.connect(f"istep_{i}.M_e",f"istep_{i+1}.M_i")
-        model.connect(f"istep_{i}.DV_tot_e",f"istep_{i+1}.DV_tot_i")
-        model.connect(f"istep_{i}.step_e",f"istep_{i+1}.step_i")
-    model.connect('M_0','istep_0.M_i')
-    model.connect('step_0','istep_0.step_i')
-    model.connect('DV_tot_0','istep_0.DV_tot_i')
-    for i in range(N):
-        model.connect('T_0',f'istep_{i}.T_0')
-        model.connect('v_e',f'istep_{i}.v_e')
-        model.connect('T_th',f'istep_{i}.T_th')
-
-    #Setting Solvers
-    # model.nonlinear_solver = NewtonSolver(maxiter = 30, iprint = 2, rtol = 1e-10)
-    # model.linear_solver = DirectSolver()
+    #All steps in one component
+    model.add_subsystem('steps', MassVelocityComp(n=N), promotes_inputs=['T_0','v_e','T_th'])
+    model.connect('M_0','steps.M_i')
+    model.connect('step_0','steps.step_i')
+    model.connect('DV_tot_0','steps.DV_tot_i')
 
     #Set-up and Run
     p.setup()
     p.run_model()
-    print(p[f'istep_{N-1}.DV_tot_e'])
-
-    case = cr.get_case(driver_cases[p.model['M_e']])
-    objectives = case.get_objectives()
-    design_vars = case.get_design_vars()
-    constraints = case.get_constraints()
-
-    # #Plotting
-    # Re = [(p['init_cond.R0']-6378000)*10**-3,]
-    # for i in range(N):
-    #     Re.append((p[f'istep_{i}.Re']-6378000)*10**-3)
-    # time = np.arange(N+1)*timestep
-    # plt.plot(time,Re)
-    # plt.show()
+    print(p['steps.DV_tot_e'][-1])
@@ -1,6 +1,5 @@
 from openmdao.api import ExplicitComponent, Group, Problem, IndepVarComp
-from numpy import exp
-from math import sqrt
+from numpy import exp, sqrt
 
 class MassPComp(ExplicitComponent):
 
@@ -0,0 +1,56 @@
+import unittest
+import numpy as np
+from openmdao.api import Problem, Group, IndepVarComp
+from openmdao.utils.assert_utils import assert_check_partials
+from mass_velocity_iter import MassIterComp, MassVelocityComp
+
+
+def build(n, chained):
+    ivc = IndepVarComp()
+    ivc.add_output('step_0', 0, units=None)
+    ivc.add_output('T_0', 0.015, units='N')
+    ivc.add_output('M_0', 150, units='kg')
+    ivc.add_output('T_th', 10.255*3600, units='s')
+    ivc.add_output('v_e', 9810, units='m/s')
+    ivc.add_output('DV_tot_0', 0, units='m/s')
+
+    p = Problem()
+    model = p.model = Group()
+    model.add_subsystem('init_cond', ivc, promotes=['*'])
+    if chained == True:
+        massvel = model.add_subsystem('massvel', Group(), promotes_inputs=['T_0','v_e','T_th'])
+        for i in range(n):
+            massvel.add_subsystem(f'istep_{i}', MassIterComp(), promotes_inputs=['T_0','v_e','T_th'])
+        for i in range(n-1):
+            massvel.connect(f'istep_{i}.M_e', f'istep_{i+1}.M_i')
+            massvel.connect(f'istep_{i}.DV_tot_e', f'istep_{i+1}.DV_tot_i')
+            massvel.connect(f'istep_{i}.step_e', f'istep_{i+1}.step_i')
+        first = 'massvel.istep_0.'
+    else:
+        model.add_subsystem('massvel', MassVelocityComp(n=n), promotes_inputs=['T_0','v_e','T_th'])
+        first = 'massvel.'
+    model.connect('M_0', first+'M_i')
+    model.connect('step_0', first+'step_i')
+    model.connect('DV_tot_0', first+'DV_tot_i')
+    p.setup()
+    p.run_model()
+    return p
+
+
+class MassVelocityTest(unittest.TestCase):
+    def test_chain(self):
+        n = 25
+        chain = build(n, chained=True)
+        p = build(n, chained=False)
+        for name in ['M_e', 'DV_tot_e', 'step_e']:
+            chained = np.array([chain[f'massvel.istep_{i}.{name}'][0] for i in range(n)])
+            np.testing.assert_allclose(p[f'massvel.{name}'], chained, rtol=1e-12)
+
+    def test_partials(self):
+        p = build(25, chained=False)
+        data = p.check_partials(out_stream=None, method='fd', form='central', step=1e-2)
+        assert_check_partials(data, atol=1e-7, rtol=1e-4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,4 +1,5 @@
 from openmdao.api import ExplicitComponent
+import numpy as np
 
 class TrajectoryComp(ExplicitComponent):
     """
@@ -19,3 +20,105 @@ class TrajectoryComp(ExplicitComponent):
         #Discretization NEEDED!!
         v = v0 + a*dt #Satellite Velocity
         outputs['r'] = inputs['mu']/v**2
+
+
+class TrajectoryMarchComp(ExplicitComponent):
+    """
+    Low thrust orbit raising over a whole time grid in one component, with the radius at every grid point as a dense output array.
+    Tangential thrust on a near circular orbit lowers the circular velocity by the delivered DeltaV (Edelbaum),
+    so r = mu/(sqrt(mu/R_0)-DV)**2. The thrust is constant within a step (optionally throttled per step), the mass decreases
+    with T/v_e, and the DeltaV of every step follows from the rocket equation. This makes each step exact, so the whole
+    march is a cumulative sum without step size error and the partials are analytic.
+
+    Either a fixed step (n steps of d_t seconds) or any increasing time grid 'times' can be given. The grid is not adapted
+    to the solution: the output size is fixed at setup and the steps are exact, so the grid only sets the output resolution.
+    """
+    def initialize(self):
+        self.options.declare('n', default=8760, types=int, desc='Number of time steps')
+        self.options.declare('d_t', default=3600., desc='Time step size in [s]')
+        self.options.declare('times', default=None, allow_none=True, desc='Increasing time grid in [s] (overrides n and d_t)')
+        self.options.declare('throttle', default=None, allow_none=True, desc='Thrust fraction per step, for example 0 in eclipse')
+
+    def setup(self):
+        times = self.options['times']
+        if times is None:
+            times = np.arange(self.options['n']+1)*self.options['d_t']
+        self.times = np.asarray(times, dtype=float)
+        if self.times.ndim != 1 or len(self.times) < 2 or not (np.diff(self.times) > 0).all():
+            raise ValueError('times must be an increasing 1D time grid with at least 2 points')
+        n = len(self.times)-1
+        throttle = self.options['throttle']
+        self.throttle = np.ones(n) if throttle is None else np.asarray(throttle, dtype=float)
+        if self.throttle.shape != (n,):
+            raise ValueError(f'throttle must have one value per step, shape ({n},), not {self.throttle.shape}')
+        #Burn time up to every grid point
+        self.burn = np.concatenate([[0.], np.cumsum(self.throttle*np.diff(self.times))])
+
+        #Input
+        self.add_input('T', units='N', desc='Satellite Thrust')
+        self.add_input('M_0', units='kg', desc='Satellite Mass at the first grid point')
+        self.add_input('v_e', val=9810., units='m/s', desc='Exhaust Velocity')
+        self.add_input('R_0', units='m', desc='Orbit Radius at the first grid point')
+        self.add_input('mu', units='m**3/s**2', desc='Gravitational Parameter Central Body', val=398600.4418*10**9)
+        #Output
+        self.add_output('M', shape=n+1, units='kg', desc='Satellite Mass at every grid point')
+        self.add_output('DV', shape=n+1, units='m/s', desc='Delivered DeltaV at every grid point')
+        self.add_output('v', shape=n+1, units='m/s', desc='Circular Orbit Velocity at every grid point')
+        self.add_output('r', shape=n+1, units='m', desc='Circular Orbit Radius at every grid point')
+
+        rows, cols = np.arange(n+1), np.zeros(n+1, dtype=int)
+        self.declare_partials('M', 'M_0', rows=rows, cols=cols, val=1.)
+        self.declare_partials('M', ['T', 'v_e'], rows=rows, cols=cols)
+        self.declare_partials(['DV', 'v'], ['T', 'M_0', 'v_e'], rows=rows, cols=cols)
+        self.declare_partials('v', ['R_0', 'mu'], rows=rows, cols=cols)
+        self.declare_partials('r', ['T', 'M_0', 'v_e', 'R_0', 'mu'], rows=rows, cols=cols)
+
+    def compute(self, inputs, outputs):
+        T, M_0, v_e, R_0, mu = (inputs[name][0] for name in ['T', 'M_0', 'v_e', 'R_0', 'mu'])
+        M = M_0-T*self.burn/v_e
+        if M[-1] <= 0:
+            raise ValueError('All mass is spent before the end of the time grid')
+        DV = v_e*np.log(M_0/M)
+        v = np.sqrt(mu/R_0)-DV
+        if v[-1] <= 0:
+            raise ValueError('The DeltaV exceeds the initial circular velocity before the end of the time grid')
+        outputs['M'] = M
+        outputs['DV'] = DV
+        outputs['v'] = v
+        outputs['r'] = mu/v**2
+
+    def compute_partials(self, inputs, partials):
+        T, M_0, v_e, R_0, mu = (inputs[name][0] for name in ['T', 'M_0', 'v_e', 'R_0', 'mu'])
+        M = M_0-T*self.burn/v_e
+        v = np.sqrt(mu/R_0)-v_e*np.log(M_0/M)
+        dM = {'T': -self.burn/v_e, 'v_e': (M_0-M)/v_e}
+        partials['M', 'T'] = dM['T']
+        partials['M', 'v_e'] = dM['v_e']
+        #DV = v_e*(log(M_0)-log(M))
+        dDV = {'T': -v_e*dM['T']/M, 'M_0': v_e*(1/M_0-1/M), 'v_e': np.log(M_0/M)-dM['v_e']*v_e/M}
+        dv = {name: -value for name, value in dDV.items()}
+        dv['R_0'] = -0.5*np.sqrt(mu/R_0)/R_0*np.ones(len(M))
+        dv['mu'] = 0.5/np.sqrt(mu*R_0)*np.ones(len(M))
+        drdv = -2*mu/v**3
+        for name in dDV:
+            partials['DV', name] = dDV[name]
+        for name in dv:
+            partials['v', name] = dv[name]
+            partials['r', name] = drdv*dv[name]
+        partials['r', 'mu'] += 1/v**2
+
+
+if __name__ == '__main__':
+    from openmdao.api import Problem
+    import time
+    #Year long transfer at one hour resolution
+    p = Problem()
+    p.model.add_subsystem('march', TrajectoryMarchComp(n=365*24, d_t=3600.), promotes=['*'])
+    p.setup()
+    p['T'] = 0.015
+    p['M_0'] = 150.
+    p['R_0'] = 6778000.
+    start_time = time.time()
+    p.run_model()
+    print(f"executed in {(time.time()-start_time)} seconds")
+    print('Final Orbit Height [km]', (p['r'][-1]-6378000)*10**-3)